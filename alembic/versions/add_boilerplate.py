@@ -0,0 +1,24 @@
+"""Add boilerplate to pdf_documents
+
+Revision ID: 3c4d5e6f7a8b
+Revises: 2b3c4d5e6f7a
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3c4d5e6f7a8b'
+down_revision = '2b3c4d5e6f7a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Running header/footer blocks per page, so reused extractions summarize like fresh ones
+    op.add_column('pdf_documents', sa.Column('boilerplate', sa.Text(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('pdf_documents', 'boilerplate')
@@ -0,0 +1,26 @@
+"""Add content digest to pdf_documents
+
+Revision ID: 2b3c4d5e6f7a
+Revises: 1a2b3c4d5e6f
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2b3c4d5e6f7a'
+down_revision = '1a2b3c4d5e6f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Add the versioned content hash used to reuse extraction results
+    op.add_column('pdf_documents', sa.Column('content_digest', sa.String(), nullable=True))
+    op.create_index(op.f('ix_pdf_documents_content_digest'), 'pdf_documents', ['content_digest'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_pdf_documents_content_digest'), table_name='pdf_documents')
+    op.drop_column('pdf_documents', 'content_digest')
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Query, Path
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
+import asyncio
 import os
+import logging
 from typing import Any, List
 from sqlalchemy.orm import Session
 
@@ -8,12 +10,36 @@ from app.config import settings
 from app.models.schemas import PDFExtractResponse, ErrorResponse, PDFDocumentListResponse, PDFDocumentResponse
 from app.services.pdf_service import PDFService
 from app.utils.file_utils import save_upload_file
+from app.utils.cache import document_cache, document_list_cache
 from app.database.connection import get_db
 from app.database.repository import PDFRepository
 
+logger = logging.getLogger(__name__)
+
 # Create router
 router = APIRouter(tags=["PDF Operations"])
 
+def _response_size(result: PDFExtractResponse) -> int:
+    """
+    Approximate the memory held by a response as its text and table cell characters.
+
+    Args:
+        result (PDFExtractResponse): Processed PDF data
+
+    Returns:
+        int: Number of characters in page texts and table cells
+    """
+    text_size = sum(map(len, result.text.pages.values()))
+    table_size = sum(
+        len(str(cell))
+        for page_tables in result.tables.pages.values()
+        for table in page_tables
+        for row in table
+        for cell in row
+        if cell is not None
+    )
+    return text_size + table_size
+
 
 @router.post(
     "/extract",
@@ -42,7 +68,7 @@ async def extract_pdf(
         PDFExtractResponse: Extracted text, tables, and image links with document ID
     """
     # Validate file extension
-    if not file.filename.lower().endswith('.pdf'):
+    if os.path.splitext(file.filename)[1].lower() != ".pdf":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only PDF files are supported."
@@ -62,10 +88,10 @@ async def extract_pdf(
                 detail="Failed to generate document ID"
             )
 
-        # Debug: Print the response data
-        print(f"Extract response: ID={result.id}, Filename={result.filename}")
-        print(f"Extract response contains {len(result.images)} images")
-        print(f"Summary included: {result.summary is not None}")
+        logger.debug(
+            "Extract response: ID=%s, Filename=%s, images=%d, summary included=%s",
+            result.id, result.filename, len(result.images), result.summary is not None
+        )
 
         return result
 
@@ -97,6 +123,11 @@ async def get_pdf_document(
     Returns:
         PDFExtractResponse: Processed PDF data
     """
+    # Processed documents are immutable, so serve them from the cache when possible
+    cached = document_cache.get(document_id)
+    if cached is not None:
+        return cached
+
     result = await PDFService.get_pdf_by_id(db, document_id)
 
     if not result:
@@ -105,9 +136,49 @@ async def get_pdf_document(
             detail=f"Document with ID {document_id} not found"
         )
 
+    document_cache.set(document_id, result, size=_response_size(result))
+
     return result
 
 
+@router.get(
+    "/documents/{document_id}/stream",
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        404: {"model": ErrorResponse},
+    },
+    summary="Stream processed PDF by ID",
+    description="Stream a previously processed PDF document as newline-delimited JSON, one line per "
+                "text page, table and image link. Suited to large documents."
+)
+async def stream_pdf_document(
+        document_id: str = Path(..., description="ID of the processed document"),
+        db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Stream a processed PDF document by ID.
+
+    Args:
+        document_id (str): ID of the processed document
+        db (Session): Database session
+
+    Returns:
+        StreamingResponse: Document metadata followed by its content as NDJSON lines
+    """
+    document = await asyncio.to_thread(PDFRepository.get_document, db, document_id)
+
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Document with ID {document_id} not found"
+        )
+
+    return StreamingResponse(
+        PDFService.stream_pdf_content(db, document),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.get(
     "/documents",
     response_model=PDFDocumentListResponse,
@@ -130,63 +201,27 @@ async def list_pdf_documents(
     Returns:
         PDFDocumentListResponse: List of processed PDF documents
     """
-    documents = PDFRepository.list_documents(db, skip=skip, limit=limit)
-    total = len(PDFRepository.list_documents(db))
-
-    # Convert to Pydantic models
-    processed_documents = []
-    for doc in documents:
-        # Convert image models to image responses with URLs
-        image_responses = []
-        for img in doc.images:
-            image_responses.append({
-                "id": img.id,
-                "page_number": img.page_number,
-                "image_index": img.image_index,
-                "filename": img.filename,
-                "created_at": img.created_at,
-                "url": f"{settings.API_PREFIX}/images/{img.filename}"
-            })
-
-        # Convert text content models
-        text_contents = []
-        for text in doc.text_contents:
-            text_contents.append({
-                "id": text.id,
-                "page_number": text.page_number,
-                "content": text.content,
-                "created_at": text.created_at
-            })
-
-        # Convert table models
-        tables = []
-        for table in doc.tables:
-            tables.append({
-                "id": table.id,
-                "page_number": table.page_number,
-                "table_index": table.table_index,
-                "table_data": table.table_data,
-                "created_at": table.created_at
-            })
-
-        # Add processed document
-        processed_documents.append({
-            "id": doc.id,
-            "filename": doc.filename,
-            "original_filename": doc.original_filename,
-            "created_at": doc.created_at,
-            "updated_at": doc.updated_at,
-            "images": image_responses,
-            "text_contents": text_contents,
-            "tables": tables
-        })
-
-    return PDFDocumentListResponse(
+    cache_key = (skip, limit)
+    cached = document_list_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Run the blocking queries in a worker thread
+    documents = await asyncio.to_thread(PDFRepository.list_documents, db, skip=skip, limit=limit)
+    total = await asyncio.to_thread(PDFRepository.count_documents, db)
+
+    # Validate ORM objects directly into response models
+    processed_documents = [PDFDocumentResponse.model_validate(doc) for doc in documents]
+
+    response = PDFDocumentListResponse(
         documents=processed_documents,
         total=total,
         skip=skip,
         limit=limit
     )
+    document_list_cache.set(cache_key, response)
+
+    return response
 
 
 @router.get(
@@ -204,29 +239,3 @@ async def debug_generate_uuid():
     from app.database.models import generate_uuid
 
     return {"generated_uuid": generate_uuid()}
-
-
-@router.get(
-    "/images/{filename}",
-    summary="Download an extracted image",
-    description="Download an image that was extracted from a PDF."
-)
-async def download_image(filename: str) -> Any:
-    """
-    Download an image that was extracted from a PDF.
-
-    Args:
-        filename (str): The image filename
-
-    Returns:
-        FileResponse: The image file
-    """
-    file_path = os.path.join(settings.IMAGE_FOLDER, filename)
-
-    if not os.path.exists(file_path):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Image not found: {filename}"
-        )
-
-    return FileResponse(file_path)
\ No newline at end of file
@@ -50,15 +50,7 @@ async def get_llm_status() -> Dict:
         "llm_service": {
             "available": available,
             "provider": settings.LLM_PROVIDER,
-            "model": (
-                settings.OLLAMA_MODEL
-                if settings.LLM_PROVIDER.lower() == "ollama"
-                else settings.OPENROUTER_MODEL
-            ),
-            "host": (
-                settings.OLLAMA_HOST
-                if settings.LLM_PROVIDER.lower() == "ollama"
-                else "https://openrouter.ai/api/v1"
-            ),
+            "model": settings.llm_model,
+            "host": settings.llm_host,
         }
     }
\ No newline at end of file
@@ -8,9 +8,7 @@ from app.database.connection import Base
 
 def generate_uuid():
     """Generate a UUID string."""
-    uuid_value = str(uuid.uuid4())
-    print(f"Generated UUID: {uuid_value}")
-    return uuid_value
+    return str(uuid.uuid4())
 
 
 class PDFDocument(Base):
@@ -20,6 +18,10 @@ class PDFDocument(Base):
     id = Column(String, primary_key=True, default=generate_uuid)
     filename = Column(String, nullable=False)
     original_filename = Column(String, nullable=False)
+    # Content hash plus extraction version, used to reuse earlier results
+    content_digest = Column(String, nullable=True, index=True)
+    # Running header/footer blocks keyed by page name, as JSON; left out of summaries
+    boilerplate = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -1,16 +1,77 @@
-import json
+import logging
 import os
 import uuid
-from sqlalchemy.orm import Session
-from typing import Dict, List, Any, Optional
+from datetime import datetime
+import orjson
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, selectinload
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
 from app.database.models import PDFDocument, TextContent, Image, Table
 from app.models.schemas import FileInfo
 
+logger = logging.getLogger(__name__)
+
 
 class PDFRepository:
     """Repository for PDF document database operations."""
 
+    @staticmethod
+    def _relation_loaders() -> tuple:
+        """
+        Loader options that fetch all document relations eagerly.
+
+        Each collection is loaded with one extra IN query for the whole result
+        set, instead of one lazy query per document and relation.
+
+        Returns:
+            tuple: SQLAlchemy loader options
+        """
+        return (
+            selectinload(PDFDocument.images),
+            selectinload(PDFDocument.text_contents),
+            selectinload(PDFDocument.tables),
+        )
+
+    @staticmethod
+    def _page_number(page_key: str) -> int:
+        """Extract the page number from a page key (e.g., "Page 1" -> 1)."""
+        return int(page_key.split()[1])
+
+    @staticmethod
+    def _text_rows(document_id: str, text_data: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Build text_contents rows for a Core INSERT."""
+        page_number = PDFRepository._page_number
+        return [
+            {"document_id": document_id, "page_number": page_number(page_key), "content": content}
+            for page_key, content in text_data.items()
+        ]
+
+    @staticmethod
+    def _image_rows(document_id: str, images: List[Tuple[int, int, str]]) -> List[Dict[str, Any]]:
+        """Build images rows for a Core INSERT."""
+        return [
+            {"document_id": document_id, "page_number": page, "image_index": index, "filename": filename}
+            for page, index, filename in images
+        ]
+
+    @staticmethod
+    def _table_rows(document_id: str, tables_data: Dict[str, List[List[Any]]]) -> List[Dict[str, Any]]:
+        """Build tables rows for a Core INSERT."""
+        page_number = PDFRepository._page_number
+        return [
+            {
+                "document_id": document_id,
+                "page_number": page_number(page_key),
+                "table_index": table_index,
+                # Stored in a Text column, so decode orjson's bytes
+                "table_data": orjson.dumps(table_data).decode("utf-8"),
+            }
+            for page_key, page_tables in tables_data.items()
+            for table_index, table_data in enumerate(page_tables)
+        ]
+
     @staticmethod
     def create_document(db: Session, file_info: FileInfo) -> PDFDocument:
         """
@@ -35,128 +96,153 @@ class PDFRepository:
         db.commit()
         db.refresh(db_document)
 
-        # Debug print
-        print(f"Created document with ID: {db_document.id}")
+        logger.debug("Created document with ID: %s", db_document.id)
 
         return db_document
 
     @staticmethod
-    def save_text_content(db: Session, document_id: str, text_data: Dict[str, str]) -> List[TextContent]:
+    def save_all(
+        db: Session,
+        document_id: str,
+        text_data: Dict[str, str],
+        images: List[Tuple[int, int, str]],
+        tables_data: Dict[str, List[List[Any]]],
+        content_digest: Optional[str] = None,
+        boilerplate: Optional[Dict[str, List[str]]] = None
+    ) -> None:
         """
-        Save text content for a document.
+        Save the text, image metadata and tables of a document in one transaction.
+
+        Each kind of row is written with a single executemany INSERT and the
+        transaction is committed once, instead of once per kind. Nothing is
+        saved if any insert fails.
+
+        The content digest and boilerplate are set in the same transaction,
+        so only documents whose content was saved completely can be found by
+        get_by_digest.
 
         Args:
             db (Session): Database session
             document_id (str): Document ID
             text_data (Dict[str, str]): Text data with page numbers as keys
-
-        Returns:
-            List[TextContent]: List of created text content records
+            images (List[Tuple[int, int, str]]): (page, index, filename) for each image
+            tables_data (Dict[str, List[List[Any]]]): Tables data with page numbers as keys
+            content_digest (Optional[str]): Versioned content hash of the file
+            boilerplate (Optional[Dict[str, List[str]]]): Running header/footer blocks with page numbers as keys
         """
-        text_contents = []
-
-        for page_key, content in text_data.items():
-            # Extract page number from the key (e.g., "Page 1" -> 1)
-            page_number = int(page_key.split()[1])
-
-            text_content = TextContent(
-                document_id=document_id,
-                page_number=page_number,
-                content=content
-            )
-            db.add(text_content)
-            text_contents.append(text_content)
+        inserts = (
+            (TextContent, PDFRepository._text_rows(document_id, text_data)),
+            (Image, PDFRepository._image_rows(document_id, images)),
+            (Table, PDFRepository._table_rows(document_id, tables_data)),
+        )
 
-        db.commit()
-        return text_contents
+        try:
+            for model, rows in inserts:
+                if rows:
+                    db.execute(insert(model), rows)
+            values = {}
+            if content_digest:
+                values["content_digest"] = content_digest
+            if boilerplate:
+                # Stored in a Text column, so decode orjson's bytes
+                values["boilerplate"] = orjson.dumps(boilerplate).decode("utf-8")
+            if values:
+                db.execute(update(PDFDocument).where(PDFDocument.id == document_id).values(**values))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
 
     @staticmethod
-    def save_images(db: Session, document_id: str, images: List[Dict[str, Any]]) -> List[Image]:
+    def get_document(db: Session, document_id: str) -> Optional[PDFDocument]:
         """
-        Save image metadata for a document.
+        Get a document by ID.
 
         Args:
             db (Session): Database session
             document_id (str): Document ID
-            images (List[Dict[str, Any]]): List of image metadata
 
         Returns:
-            List[Image]: List of created image records
+            Optional[PDFDocument]: Document if found, None otherwise
         """
-        db_images = []
-
-        for img in images:
-            image = Image(
-                document_id=document_id,
-                page_number=img["page"],
-                image_index=img["index"],
-                filename=img["filename"]
-            )
-            db.add(image)
-            db_images.append(image)
-
-        db.commit()
-        return db_images
+        return db.query(PDFDocument).filter(PDFDocument.id == document_id).first()
 
     @staticmethod
-    def save_tables(db: Session, document_id: str, tables_data: Dict[str, List[List[Any]]]) -> List[Table]:
+    def get_document_with_relations(db: Session, document_id: str) -> Optional[PDFDocument]:
         """
-        Save table data for a document.
+        Get a document with all its related data.
 
         Args:
             db (Session): Database session
             document_id (str): Document ID
-            tables_data (Dict[str, List[List[Any]]]): Tables data with page numbers as keys
 
         Returns:
-            List[Table]: List of created table records
+            Optional[PDFDocument]: Document with relations if found, None otherwise
         """
-        tables = []
-
-        for page_key, page_tables in tables_data.items():
-            # Extract page number from the key (e.g., "Page 1" -> 1)
-            page_number = int(page_key.split()[1])
-
-            for table_index, table_data in enumerate(page_tables):
-                table = Table(
-                    document_id=document_id,
-                    page_number=page_number,
-                    table_index=table_index,
-                    table_data=json.dumps(table_data)
-                )
-                db.add(table)
-                tables.append(table)
-
-        db.commit()
-        return tables
+        return (
+            db.query(PDFDocument)
+            .options(*PDFRepository._relation_loaders())
+            .filter(PDFDocument.id == document_id)
+            .first()
+        )
 
     @staticmethod
-    def get_document(db: Session, document_id: str) -> Optional[PDFDocument]:
+    def get_by_digest(db: Session, content_digest: str, created_after: datetime) -> Optional[PDFDocument]:
         """
-        Get a document by ID.
+        Get the newest document with the given content digest.
 
         Args:
             db (Session): Database session
-            document_id (str): Document ID
+            content_digest (str): Versioned content hash of the file
+            created_after (datetime): Only consider documents created at or after this time
 
         Returns:
-            Optional[PDFDocument]: Document if found, None otherwise
+            Optional[PDFDocument]: Document with relations if found, None otherwise
         """
-        return db.query(PDFDocument).filter(PDFDocument.id == document_id).first()
+        return (
+            db.query(PDFDocument)
+            .options(*PDFRepository._relation_loaders())
+            .filter(
+                PDFDocument.content_digest == content_digest,
+                PDFDocument.created_at >= created_after
+            )
+            .order_by(PDFDocument.created_at.desc())
+            .first()
+        )
 
     @staticmethod
-    def get_document_with_relations(db: Session, document_id: str) -> Optional[PDFDocument]:
+    def iter_document_rows(db: Session, document_id: str, batch_size: int = 200) -> Iterator[Tuple[str, List[Row]]]:
         """
-        Get a document with all its related data.
+        Iterate over the stored content of a document in batches.
+
+        Rows are fetched batch by batch from the open cursor (server-side where
+        the driver supports it), so the whole document is never loaded at
+        once. Text rows come first, then tables, then images, each in page order.
 
         Args:
             db (Session): Database session
             document_id (str): Document ID
+            batch_size (int): Maximum number of rows per batch
 
-        Returns:
-            Optional[PDFDocument]: Document with relations if found, None otherwise
+        Yields:
+            Tuple[str, List[Row]]: Content kind ("text", "table" or "image") and a batch of rows
         """
-        return db.query(PDFDocument).filter(PDFDocument.id == document_id).first()
+        queries = (
+            ("text", select(TextContent.page_number, TextContent.content)
+                .where(TextContent.document_id == document_id)
+                .order_by(TextContent.page_number)),
+            ("table", select(Table.page_number, Table.table_index, Table.table_data)
+                .where(Table.document_id == document_id)
+                .order_by(Table.page_number, Table.table_index)),
+            ("image", select(Image.page_number, Image.image_index, Image.filename)
+                .where(Image.document_id == document_id)
+                .order_by(Image.page_number, Image.image_index)),
+        )
+
+        for kind, query in queries:
+            result = db.execute(query.execution_options(yield_per=batch_size))
+            for rows in result.partitions():
+                yield kind, rows
 
     @staticmethod
     def list_documents(db: Session, skip: int = 0, limit: int = 100) -> List[PDFDocument]:
@@ -171,4 +257,24 @@ class PDFRepository:
         Returns:
             List[PDFDocument]: List of documents
         """
-        return db.query(PDFDocument).order_by(PDFDocument.created_at.desc()).offset(skip).limit(limit).all()
\ No newline at end of file
+        return (
+            db.query(PDFDocument)
+            .options(*PDFRepository._relation_loaders())
+            .order_by(PDFDocument.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def count_documents(db: Session) -> int:
+        """
+        Count all documents.
+
+        Args:
+            db (Session): Database session
+
+        Returns:
+            int: Total number of documents
+        """
+        return db.query(func.count(PDFDocument.id)).scalar()
@@ -1,8 +1,14 @@
-from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, status
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import asyncio
+import os
 import time
-import traceback
 import logging
 
 from app.config import settings
@@ -10,6 +16,8 @@ from app.controllers.pdf_controller import router as pdf_router
 from app.controllers.worker_controller import router as worker_router
 from app.database.connection import engine, Base
 from app.workers.file_cleanup import file_cleanup_worker
+from app.services.pdf_service import shutdown_process_pool
+from app.services.llm_service import LLMService
 
 # Configure logging
 logging.basicConfig(
@@ -29,7 +37,8 @@ app = FastAPI(
     title=settings.APP_NAME,
     debug=settings.DEBUG,
     version="1.0.0",
-    description="API for extracting text, tables, and images from PDF files."
+    description="API for extracting text, tables, and images from PDF files.",
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -42,39 +51,53 @@ app.add_middleware(
 )
 
 
+# Executor behind asyncio.to_thread, created at startup
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _blocking_thread_count() -> int:
+    """Number of threads used for blocking work run off the event loop."""
+    return settings.BLOCKING_IO_THREADS or min(32, (os.cpu_count() or 1) * 2)
+
+
 # Application startup and shutdown events
 @app.on_event("startup")
 async def startup_event():
     """Startup event handler."""
+    global _blocking_executor
     logger.info("Starting application")
 
-    # Print all configuration settings for debugging
-    logger.info("Configuration settings:")
-    logger.info(f"  DEBUG: {settings.DEBUG}")
-    logger.info(f"  API_PREFIX: {settings.API_PREFIX}")
-    logger.info(f"  APP_NAME: {settings.APP_NAME}")
-    logger.info(f"  HOST: {settings.HOST}")
-    logger.info(f"  PORT: {settings.PORT}")
-    logger.info(f"  LOG_LEVEL: {settings.LOG_LEVEL}")
-    logger.info(f"  UPLOAD_FOLDER: {settings.UPLOAD_FOLDER}")
-    logger.info(f"  IMAGE_FOLDER: {settings.IMAGE_FOLDER}")
-
-    # Try to access FILE_RETENTION_MINUTES
-    try:
-        retention = settings.FILE_RETENTION_MINUTES
-        logger.info(f"  FILE_RETENTION_MINUTES: {retention}")
-    except Exception as e:
-        logger.error(f"  Error accessing FILE_RETENTION_MINUTES: {str(e)}")
-
-    # Log LLM configuration
-    logger.info("LLM Configuration:")
-    logger.info(f"  LLM_PROVIDER: {settings.LLM_PROVIDER}")
-    if settings.LLM_PROVIDER.lower() == "ollama":
-        logger.info(f"  OLLAMA_HOST: {settings.OLLAMA_HOST}")
-        logger.info(f"  OLLAMA_MODEL: {settings.OLLAMA_MODEL}")
-    else:
-        logger.info(f"  OPENROUTER_MODEL: {settings.OPENROUTER_MODEL}")
-        logger.info(f"  OPENROUTER_API_KEY: {'***' if settings.OPENROUTER_API_KEY else 'Not set'}")
+    # Size the executor used by asyncio.to_thread for blocking PDF, file and database work
+    _blocking_executor = ThreadPoolExecutor(
+        max_workers=_blocking_thread_count(),
+        thread_name_prefix="pdf",
+    )
+    asyncio.get_running_loop().set_default_executor(_blocking_executor)
+
+    # Load the summarization tokenizer in the background; it may need a download
+    LLMService.preload_encoder()
+    logger.info(
+        "LLM provider: %s, model: %s, host: %s",
+        settings.llm_provider, settings.llm_model, settings.llm_host
+    )
+
+    # Dump the full configuration only when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        config = {
+            "DEBUG": settings.DEBUG,
+            "API_PREFIX": settings.API_PREFIX,
+            "APP_NAME": settings.APP_NAME,
+            "HOST": settings.HOST,
+            "PORT": settings.PORT,
+            "LOG_LEVEL": settings.LOG_LEVEL,
+            "UPLOAD_FOLDER": settings.UPLOAD_FOLDER,
+            "IMAGE_FOLDER": settings.IMAGE_FOLDER,
+            "FILE_RETENTION_MINUTES": settings.FILE_RETENTION_MINUTES,
+            "BLOCKING_IO_THREADS": _blocking_thread_count(),
+            "LLM_PROVIDER": settings.LLM_PROVIDER,
+            "OPENROUTER_API_KEY": "***" if settings.OPENROUTER_API_KEY else "Not set",
+        }
+        logger.debug("Configuration settings: %s", config)
 
     try:
         # Start the file cleanup worker
@@ -97,29 +120,75 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Error stopping file cleanup worker: {str(e)}")
 
+    # Stop the extraction worker processes
+    shutdown_process_pool()
 
-# Request logging middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    try:
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
-    except Exception as e:
-        print(f"Error processing request: {str(e)}")
-        print(traceback.format_exc())
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"detail": "Internal server error"}
-        )
+    # Let running blocking work finish, then release the threads
+    if _blocking_executor is not None:
+        _blocking_executor.shutdown(wait=True)
+
+
+class ProcessTimeMiddleware:
+    """
+    ASGI middleware that adds an X-Process-Time header to HTTP responses.
+
+    It also turns unhandled errors into a generic JSON 500 response. This is
+    done here rather than in an exception handler because Starlette's
+    ServerErrorMiddleware bypasses that handler and renders a traceback when
+    the app runs with debug=True.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter_ns()
+        response_started = False
+
+        async def send_with_process_time(message: Message) -> None:
+            nonlocal response_started
+            # Headers can only be changed before the response starts
+            if message["type"] == "http.response.start":
+                response_started = True
+                headers = MutableHeaders(scope=message)
+                elapsed_ns = time.perf_counter_ns() - start_time
+                # Keep the header in seconds, with fixed microsecond precision
+                headers["X-Process-Time"] = f"{elapsed_ns / 1e9:.6f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_process_time)
+        except Exception:
+            # Once the response has started the status can no longer be changed
+            if response_started:
+                raise
+            logger.exception("Error processing request")
+            response = JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"detail": "Internal server error"}
+            )
+            await response(scope, receive, send)
+
+
+# Request timing middleware
+app.add_middleware(ProcessTimeMiddleware)
 
 
 # Include routers
 app.include_router(pdf_router, prefix=f"{settings.API_PREFIX}")
 app.include_router(worker_router, prefix=f"{settings.API_PREFIX}")
 
+# Serve extracted images directly from the image folder
+app.mount(
+    f"{settings.API_PREFIX}/images",
+    StaticFiles(directory=settings.IMAGE_FOLDER),
+    name="images",
+)
+
 
 # Health check endpoint
 @app.get("/health")
@@ -137,6 +206,7 @@ async def root():
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
 
     uvicorn.run(
@@ -144,5 +214,8 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        # uvloop is not available on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
         log_level=settings.LOG_LEVEL
     )
\ No newline at end of file
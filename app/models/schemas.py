@@ -1,17 +1,22 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from app.config import settings
+
 
 class FileInfo(BaseModel):
     """Model for file information."""
     filename: str
     path: str
+    content_digest: Optional[str] = None
 
 
 class TextData(BaseModel):
     """Model for text extracted from each page."""
     pages: Dict[str, str] = Field(description="Dictionary mapping page numbers to extracted text")
+    # Running header/footer blocks found in each page, used to trim summary input; not serialized
+    _boilerplate: Dict[str, List[str]] = PrivateAttr(default_factory=dict)
 
 
 class TableData(BaseModel):
@@ -81,7 +86,12 @@ class ImageResponse(ImageBase):
     """Response model for image."""
     id: str
     created_at: datetime
-    url: str
+
+    @computed_field
+    @property
+    def url(self) -> str:
+        """URL to download the image."""
+        return f"{settings.API_PREFIX}/images/{self.filename}"
 
     class Config:
         from_attributes = True
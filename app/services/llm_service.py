@@ -1,17 +1,60 @@
+import asyncio
+import hashlib
 import logging
-from typing import Optional
+import threading
+import time
+from typing import Callable, Optional, Tuple
 
+import httpx
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from app.config import settings
+from app.utils.cache import similar_summary_cache, summary_cache
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of tokens of document text sent for summarization
+MAX_INPUT_TOKENS = 4000
+
+# Character limit used when no tokenizer is available for the model
+MAX_INPUT_CHARS = 15000
+
+# Upper bound on characters per token, used to slice the text before encoding it
+MAX_CHARS_PER_TOKEN = 8
+
+# How long an availability check result is reused (in seconds)
+AVAILABILITY_TTL_SECONDS = 30
+
+# Timeout for the provider availability probe (in seconds)
+AVAILABILITY_TIMEOUT_SECONDS = 1.0
+
+SYSTEM_PROMPT = """You are a helpful assistant that creates concise summaries of documents.
+Your task is to summarize the provided document content clearly and accurately.
+Focus on the main points, key information, and important details.
+Keep the summary informative but concise."""
+
+# The system message is identical for every request, so build it once
+SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
+USER_PROMPT_TEMPLATE = """Please summarize the following document content in approximately {max_length} words or less:
+
+---
+{text}
+---
+
+Provide a clear, structured summary that captures the essential information."""
+
 
 class LLMService:
     """Service for LLM-based text summarization."""
 
     _llm = None
+    _llm_lock = threading.Lock()
+    _encoder_lock = threading.Lock()
+    _encoder = None
+    _encoder_loaded = False
+    _available_value = False
+    _available_until = 0.0
 
     @classmethod
     def get_llm(cls):
@@ -19,12 +62,22 @@ class LLMService:
         if cls._llm is not None:
             return cls._llm
 
-        provider = settings.LLM_PROVIDER.lower()
+        with cls._llm_lock:
+            # Another caller may have created the client while we waited
+            if cls._llm is None:
+                cls._llm = cls._create_llm()
+
+        return cls._llm
+
+    @classmethod
+    def _create_llm(cls):
+        """Create a new LLM instance based on configuration."""
+        provider = settings.llm_provider
 
         if provider == "ollama":
             from langchain_ollama import ChatOllama
 
-            cls._llm = ChatOllama(
+            llm = ChatOllama(
                 base_url=settings.OLLAMA_HOST,
                 model=settings.OLLAMA_MODEL,
             )
@@ -47,9 +100,9 @@ class LLMService:
             if settings.OPENROUTER_SITE_NAME:
                 default_headers["X-Title"] = settings.OPENROUTER_SITE_NAME
 
-            cls._llm = ChatOpenAI(
+            llm = ChatOpenAI(
                 api_key=settings.OPENROUTER_API_KEY,
-                base_url="https://openrouter.ai/api/v1",
+                base_url=settings.OPENROUTER_BASE_URL,
                 model=settings.OPENROUTER_MODEL,
                 default_headers=default_headers if default_headers else None,
             )
@@ -63,12 +116,107 @@ class LLMService:
                 "Supported providers: ollama, openrouter"
             )
 
-        return cls._llm
+        return llm
 
     @classmethod
     def reset_llm(cls):
         """Reset the LLM instance (useful for testing or config changes)."""
-        cls._llm = None
+        with cls._llm_lock:
+            cls._llm = None
+            cls._encoder = None
+            cls._encoder_loaded = False
+            cls._available_value = False
+            cls._available_until = 0.0
+
+    @classmethod
+    def preload_encoder(cls) -> None:
+        """
+        Start loading the tokenizer in a background thread.
+
+        tiktoken may download its BPE file on first use, without a timeout,
+        so this is kept off the event loop and the request path.
+        """
+        threading.Thread(target=cls._get_encoder, name="tokenizer-preload", daemon=True).start()
+
+    @classmethod
+    def _get_encoder(cls):
+        """
+        Get the tokenizer for the configured model, if one is available.
+
+        Only OpenRouter models are tokenized with tiktoken; the lookup happens
+        once and a missing tokenizer is remembered as None. Blocks while
+        loading, so call it from a worker thread. Callers arriving while
+        another thread is loading get None instead of waiting.
+        """
+        if cls._encoder_loaded:
+            return cls._encoder
+
+        if not cls._encoder_lock.acquire(blocking=False):
+            return None
+
+        try:
+            if not cls._encoder_loaded:
+                cls._encoder = None
+                if settings.llm_provider == "openrouter":
+                    try:
+                        import tiktoken
+
+                        try:
+                            cls._encoder = tiktoken.encoding_for_model(settings.OPENROUTER_MODEL)
+                        except KeyError:
+                            cls._encoder = tiktoken.get_encoding("cl100k_base")
+                    except Exception as e:
+                        logger.warning(f"Tokenizer unavailable, falling back to character limit: {str(e)}")
+                cls._encoder_loaded = True
+        finally:
+            cls._encoder_lock.release()
+
+        return cls._encoder
+
+    @classmethod
+    def input_budget(cls) -> Tuple[int, Callable[[str], int]]:
+        """
+        Get the summarization input budget and the measure it is counted in.
+
+        Text is measured in tokens when a tokenizer is available and in
+        characters otherwise, matching how truncate_text cuts it. Measuring
+        is CPU-bound and this may load the tokenizer, so run it in a worker
+        thread.
+
+        Returns:
+            Tuple[int, Callable[[str], int]]: Maximum input size and a function
+            returning the size of a text
+        """
+        encoder = cls._get_encoder()
+        if encoder is None:
+            return MAX_INPUT_CHARS, len
+        return MAX_INPUT_TOKENS, lambda text: len(encoder.encode(text))
+
+    @classmethod
+    def truncate_text(cls, text: str) -> str:
+        """
+        Truncate text to the input budget for summarization.
+
+        Encoding is CPU-bound and the first call may load the tokenizer, so
+        run this in a worker thread.
+
+        Args:
+            text: The text to truncate
+
+        Returns:
+            The text limited to MAX_INPUT_TOKENS tokens, or to MAX_INPUT_CHARS
+            characters when no tokenizer is available
+        """
+        encoder = cls._get_encoder()
+        if encoder is None:
+            return text[:MAX_INPUT_CHARS]
+
+        # Only encode the prefix that can possibly fit in the token budget
+        prefix = text[:MAX_INPUT_TOKENS * MAX_CHARS_PER_TOKEN]
+        tokens = encoder.encode(prefix)
+        if len(tokens) <= MAX_INPUT_TOKENS:
+            return prefix
+        return encoder.decode(tokens[:MAX_INPUT_TOKENS])
 
     @classmethod
     async def summarize_text(cls, text: str, max_length: int = 500) -> Optional[str]:
@@ -86,31 +234,47 @@ class LLMService:
             logger.warning("Empty text provided for summarization")
             return None
 
-        try:
-            llm = cls.get_llm()
+        # Identical text summarized by the same model gives the same summary
+        namespace = (settings.llm_provider, settings.llm_model, max_length)
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        cache_key = namespace + (digest,)
+        cached = summary_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Using cached summary")
+            return cached
 
-            system_prompt = """You are a helpful assistant that creates concise summaries of documents.
-Your task is to summarize the provided document content clearly and accurately.
-Focus on the main points, key information, and important details.
-Keep the summary informative but concise."""
+        try:
+            # Tokenizing up to 32k characters would stall the event loop
+            input_text = await asyncio.to_thread(cls.truncate_text, text)
 
-            user_prompt = f"""Please summarize the following document content in approximately {max_length} words or less:
+            # Near-identical model input (e.g. a re-issued document) gives an equivalent summary;
+            # sketching and matching are CPU-bound, so they run in a worker thread
+            if similar_summary_cache.enabled:
+                similar = await asyncio.to_thread(similar_summary_cache.get, namespace, input_text)
+                if similar is not None:
+                    logger.info("Using cached summary of a near-duplicate document")
+                    summary_cache.set(cache_key, similar)
+                    return similar
 
----
-{text[:15000]}
----
+            llm = cls.get_llm()
 
-Provide a clear, structured summary that captures the essential information."""
+            user_prompt = USER_PROMPT_TEMPLATE.format(
+                max_length=max_length,
+                text=input_text,
+            )
 
             messages = [
-                SystemMessage(content=system_prompt),
+                SYSTEM_MESSAGE,
                 HumanMessage(content=user_prompt),
             ]
 
-            response = llm.invoke(messages)
+            response = await llm.ainvoke(messages)
             summary = response.content.strip()
 
             logger.info(f"Successfully generated summary of {len(summary)} characters")
+            summary_cache.set(cache_key, summary)
+            if similar_summary_cache.enabled:
+                await asyncio.to_thread(similar_summary_cache.set, namespace, input_text, summary)
             return summary
 
         except Exception as e:
@@ -119,10 +283,40 @@ Provide a clear, structured summary that captures the essential information."""
 
     @classmethod
     async def is_available(cls) -> bool:
-        """Check if the LLM service is available and configured properly."""
+        """
+        Check if the LLM service is available and configured properly.
+
+        The result is cached for AVAILABILITY_TTL_SECONDS so frequent status
+        checks do not probe the provider on every call.
+        """
+        if time.monotonic() < cls._available_until:
+            return cls._available_value
+
+        available = await cls._check_available()
+        cls._available_value = available
+        cls._available_until = time.monotonic() + AVAILABILITY_TTL_SECONDS
+
+        return available
+
+    @classmethod
+    async def _check_available(cls) -> bool:
+        """Probe the configured provider without creating an LLM client."""
+        provider = settings.llm_provider
+
+        if provider == "openrouter":
+            if not settings.OPENROUTER_API_KEY:
+                logger.error("LLM service not available: OPENROUTER_API_KEY is not set")
+                return False
+            return True
+
+        if provider != "ollama":
+            logger.error(f"LLM service not available: unsupported LLM provider {provider}")
+            return False
+
         try:
-            llm = cls.get_llm()
-            return llm is not None
-        except Exception as e:
+            async with httpx.AsyncClient(timeout=AVAILABILITY_TIMEOUT_SECONDS) as client:
+                response = await client.head(f"{settings.OLLAMA_HOST}/api/tags")
+            return response.is_success
+        except httpx.HTTPError as e:
             logger.error(f"LLM service not available: {str(e)}")
             return False
@@ -1,74 +1,467 @@
+import asyncio
+import datetime
 import fitz  # PyMuPDF
+import orjson
 import pdfplumber
-import io
+import math
+import mmap
+import multiprocessing
 import os
 import logging
-from PIL import Image as PILImage
-from typing import Dict, List, Tuple, Any, Optional
+import re
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from itertools import islice
+from operator import attrgetter
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Tuple, Any, Optional
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.models.schemas import TextData, TableData, ImageLink, FileInfo, PDFExtractResponse
-from app.utils.file_utils import get_image_url
+from app.utils.file_utils import BackgroundFileWriter, get_image_url
+from app.utils.cache import document_list_cache
 from app.database.repository import PDFRepository
 from app.database.models import PDFDocument
 from app.services.llm_service import LLMService
 
 logger = logging.getLogger(__name__)
 
+# Bump when extraction output changes so earlier results are not reused
+EXTRACTION_VERSION = 2
+
+# Maximum number of chunks summarized per document; later text is ignored
+SUMMARY_MAX_CHUNKS = 8
+
+# Maximum number of chunk summaries generated at the same time for one document
+SUMMARY_CONCURRENCY = 4
+
+# Share of the page height at the top and bottom where running headers and footers sit
+MARGIN_FRACTION = 0.08
+
+# A margin block is boilerplate when it repeats on this share of pages, and on at least the minimum
+BOILERPLATE_PAGE_SHARE = 0.5
+BOILERPLATE_MIN_PAGES = 3
+
+# Image formats browsers display directly; these are never re-encoded
+WEB_IMAGE_FORMATS = frozenset({"jpeg", "jpg", "png", "gif", "webp"})
+
+# Number of stored rows fetched and emitted together when streaming a document
+STREAM_BATCH_SIZE = 200
+
+# Shared pool for page-parallel extraction, created on first use
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+# Limits concurrent extractions; created lazily inside the running event loop
+_extraction_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_extraction_semaphore() -> asyncio.Semaphore:
+    """
+    Get the semaphore that bounds concurrent PDF extraction.
+
+    Returns:
+        asyncio.Semaphore: Shared extraction semaphore
+    """
+    global _extraction_semaphore
+    if _extraction_semaphore is None:
+        _extraction_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_EXTRACTIONS)
+    return _extraction_semaphore
+
+
+def _extraction_process_count() -> int:
+    """Number of worker processes used for page-parallel extraction."""
+    return settings.EXTRACTION_PROCESSES or os.cpu_count() or 1
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared extraction process pool, creating it if needed.
+
+    Workers are spawned rather than forked, so they never inherit the
+    server's threads or open database connections. Spawned workers do
+    re-import the parent's __main__ module: when the server is started with
+    `python -m app.main`, every worker imports app.main as well, creating
+    the database tables and building the app once more. Start it with
+    `uvicorn app.main:app` (as the Dockerfile does) to avoid that.
+
+    Returns:
+        ProcessPoolExecutor: The shared process pool
+    """
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=_extraction_process_count(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _process_pool
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken process pool so the next caller gets a fresh one."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_in_process_pool(func: Callable, calls: List[tuple]) -> List[Any]:
+    """
+    Run func once per argument tuple in the shared process pool.
+
+    A worker that dies (e.g. MuPDF crashing on a malformed PDF, or the OOM
+    killer) breaks the whole pool. The broken pool is then replaced and the
+    calls are retried once; a second failure is raised to the caller.
+
+    Args:
+        func (Callable): Picklable module-level function to run
+        calls (List[tuple]): Positional arguments for each call
+
+    Returns:
+        List[Any]: Results in the order of calls
+    """
+    for attempt in range(2):
+        pool = _get_process_pool()
+        try:
+            futures = [pool.submit(func, *args) for args in calls]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            _discard_process_pool(pool)
+            if attempt:
+                raise
+            logger.warning("Extraction worker process died, retrying in a new process pool")
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared extraction process pool, if it was started."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown()
+            _process_pool = None
+
+
+@contextmanager
+def _open_pdf(path: str) -> Iterator[fitz.Document]:
+    """
+    Open a PDF backed by a read-only memory map of the file.
+
+    PyMuPDF reads the mapped pages straight from the OS page cache instead
+    of copying the file into its own buffers.
+
+    Args:
+        path (str): Path to the PDF file
+
+    Yields:
+        fitz.Document: The open document; closed, and the file unmapped, on exit
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        # Ask for a larger readahead window where supported (Linux)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        # The mapping stays valid after the descriptor is closed
+        os.close(fd)
+
+    view = memoryview(mapped)
+    try:
+        doc = fitz.open(stream=view, filetype="pdf")
+        try:
+            yield doc
+        finally:
+            doc.close()
+    finally:
+        # The document must be closed before the memory it reads from goes away
+        view.release()
+        mapped.close()
+
+
+def _image_to_png(doc: fitz.Document, xref: int) -> bytes:
+    """
+    Decode an embedded image and encode it as PNG.
+
+    Args:
+        doc (fitz.Document): Open document containing the image
+        xref (int): Cross-reference number of the image
+
+    Returns:
+        bytes: PNG-encoded image
+    """
+    pixmap = fitz.Pixmap(doc, xref)
+    # PNG has no CMYK mode
+    if pixmap.n - pixmap.alpha >= 4:
+        pixmap = fitz.Pixmap(fitz.csRGB, pixmap)
+    return pixmap.tobytes("png")
+
+
+def _extract_pages_chunk(
+    path: str,
+    start: int,
+    end: int,
+    document_id: str,
+    image_folder: str,
+    convert_images: bool = False
+) -> Tuple[Dict[str, str], List[Dict[str, Any]], Dict[str, List[List[List[Any]]]], Dict[str, List[str]]]:
+    """
+    Extract text, images and tables from a range of pages.
+
+    Runs in a worker process (or inline for small documents), so it opens
+    its own document and returns plain, picklable data. Text is read as
+    blocks; the blocks lying in the top or bottom margin of a page are
+    also returned, so running headers and footers can be recognized.
+
+    Args:
+        path (str): Path to the PDF file
+        start (int): First page index (inclusive)
+        end (int): Last page index (exclusive)
+        document_id (str): ID of the document in the database
+        image_folder (str): Directory where extracted images are written
+        convert_images (bool): Convert images in non-web formats to PNG
+
+    Returns:
+        Tuple[Dict[str, str], List[Dict[str, Any]], Dict[str, List[List[List[Any]]]], Dict[str, List[str]]]:
+        Page text keyed by page name, image records with page, index and
+        filename, tables keyed by page name for pages that have any, and
+        margin block texts keyed by page name for pages that have any
+    """
+    text_data = {}
+    image_records = []
+    table_data = {}
+    margin_blocks = {}
+
+    with _open_pdf(path) as doc:
+        # Image files are written in the background while later pages are extracted
+        with BackgroundFileWriter() as writer:
+            # Bind per-image lookups once; technical manuals can hold thousands of figures
+            join = os.path.join
+            extract_image = doc.extract_image
+            write = writer.write
+            add_record = image_records.append
+
+            for page_num in range(start, end):
+                page = doc.load_page(page_num)
+                page_number = page_num + 1
+                page_key = f"Page {page_number}"
+
+                # Text blocks (x0, y0, x1, y1, text, block_no, block_type) in plain extraction order;
+                # "dict"/"rawdict" build per-span objects and are several times slower
+                blocks = [block for block in page.get_text("blocks", sort=False) if block[6] == 0]
+                # Joined blocks are the same text as get_text("text")
+                text_data[page_key] = "".join(block[4] for block in blocks)
+
+                top = page.rect.y0 + page.rect.height * MARGIN_FRACTION
+                bottom = page.rect.y1 - page.rect.height * MARGIN_FRACTION
+                margins = [block[4] for block in blocks if block[3] <= top or block[1] >= bottom]
+                if margins:
+                    margin_blocks[page_key] = margins
+
+                # Detect tables on the already-parsed page
+                page_tables = [table.extract() for table in page.find_tables().tables]
+                if page_tables:
+                    table_data[page_key] = page_tables
+
+                # Include document_id in the filename
+                filename_prefix = f"{document_id}_page_{page_number}_image_"
+
+                for img_index, img in enumerate(page.get_images(full=True), start=1):
+                    xref = img[0]
+                    base_image = extract_image(xref)
+                    image_bytes = base_image["image"]
+                    image_ext = base_image["ext"]
+
+                    # Web formats, the common case, are written as extracted without decoding
+                    if convert_images and image_ext not in WEB_IMAGE_FORMATS:
+                        try:
+                            image_bytes = _image_to_png(doc, xref)
+                            image_ext = "png"
+                        except Exception as e:
+                            logger.warning(f"Could not convert {image_ext} image {xref} to PNG: {str(e)}")
+
+                    image_filename = f"{filename_prefix}{img_index}.{image_ext}"
+                    write(join(image_folder, image_filename), image_bytes)
+
+                    add_record({
+                        "page": page_number,
+                        "index": img_index,
+                        "filename": image_filename,
+                    })
+
+    return text_data, image_records, table_data, margin_blocks
+
+
+def _normalize_block(text: str) -> str:
+    """Normalize a text block so running headers/footers with changing page numbers compare equal."""
+    return re.sub(r"\d+", "#", " ".join(text.split())).lower()
+
+
+def _find_boilerplate(margin_blocks: Dict[str, List[str]], page_count: int) -> Dict[str, List[str]]:
+    """
+    Find running headers and footers among the margin blocks of a document.
+
+    Args:
+        margin_blocks (Dict[str, List[str]]): Margin block texts keyed by page name
+        page_count (int): Number of pages in the document
+
+    Returns:
+        Dict[str, List[str]]: Boilerplate block texts keyed by page name for pages that have any
+    """
+    min_pages = max(BOILERPLATE_MIN_PAGES, math.ceil(page_count * BOILERPLATE_PAGE_SHARE))
+    if len(margin_blocks) < min_pages:
+        return {}
+
+    # Count each normalized block once per page
+    counts = Counter(
+        normalized
+        for blocks in margin_blocks.values()
+        for normalized in {_normalize_block(block) for block in blocks}
+    )
+    repeated = {normalized for normalized, count in counts.items() if count >= min_pages and normalized}
+
+    boilerplate = {}
+    for page_key, blocks in margin_blocks.items():
+        page_boilerplate = [block for block in blocks if _normalize_block(block) in repeated]
+        if page_boilerplate:
+            boilerplate[page_key] = page_boilerplate
+    return boilerplate
+
+
+def _extract_page_tables(pdf: "pdfplumber.PDF", page_numbers: List[int]) -> Dict[str, List[List[List[Any]]]]:
+    """
+    Extract tables from the given pages of an open pdfplumber document.
+
+    Args:
+        pdf (pdfplumber.PDF): Open pdfplumber document
+        page_numbers (List[int]): Zero-based pages to check
+
+    Returns:
+        Dict[str, List[List[List[Any]]]]: Tables keyed by page name for pages that have any
+    """
+    tables = {}
+    for page_num in page_numbers:
+        extracted_tables = pdf.pages[page_num].extract_tables()
+        if extracted_tables:
+            tables[f"Page {page_num + 1}"] = extracted_tables
+    return tables
+
+
+def _extract_tables_chunk(path: str, page_numbers: List[int]) -> Dict[str, List[List[List[Any]]]]:
+    """
+    Extract tables from a set of pages with pdfplumber.
+
+    Runs in a worker process, so it opens its own document and returns
+    plain, picklable data.
+
+    Args:
+        path (str): Path to the PDF file
+        page_numbers (List[int]): Zero-based pages to check
+
+    Returns:
+        Dict[str, List[List[List[Any]]]]: Tables keyed by page name for pages that have any
+    """
+    with pdfplumber.open(path) as pdf:
+        return _extract_page_tables(pdf, page_numbers)
+
 
 class PDFService:
     """Service for handling PDF operations."""
 
     @staticmethod
-    async def extract_text_and_images(file_info: FileInfo, document_id: str) -> Tuple[TextData, List[ImageLink]]:
+    async def extract_text_and_images(
+        file_info: FileInfo,
+        document_id: str
+    ) -> Tuple[TextData, List[ImageLink], TableData]:
         """
-        Extract text and images from a PDF file.
+        Extract text, images and tables from a PDF file in a single parse.
 
         Args:
             file_info (FileInfo): Information about the PDF file
             document_id (str): ID of the document in the database
 
         Returns:
-            Tuple[TextData, List[ImageLink]]: Extracted text and image links
+            Tuple[TextData, List[ImageLink], TableData]: Extracted text, image links and tables
         """
-        doc = fitz.open(file_info.path)
-        text_data = {}
-        image_links = []
+        return await asyncio.to_thread(PDFService._extract_text_and_images_sync, file_info.path, document_id)
 
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text_data[f"Page {page_num + 1}"] = page.get_text()
+    @staticmethod
+    def _extract_text_and_images_sync(path: str, document_id: str) -> Tuple[TextData, List[ImageLink], TableData]:
+        """
+        Extract text, images and tables from a PDF file, blocking the calling thread.
 
-            for img_index, img in enumerate(page.get_images(full=True)):
-                xref = img[0]
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
-                image = PILImage.open(io.BytesIO(image_bytes))
+        Large documents are split into page chunks that are extracted in
+        parallel worker processes; small ones are extracted inline. When
+        USE_PDFPLUMBER_TABLE_FALLBACK is enabled, pages where PyMuPDF finds
+        no tables are re-checked with pdfplumber.
 
-                # Include document_id in the filename
-                image_filename = f"{document_id}_page_{page_num + 1}_image_{img_index + 1}.{image_ext}"
-                image_path = os.path.join(settings.IMAGE_FOLDER, image_filename)
-                image.save(image_path)
-
-                image_links.append(
-                    ImageLink(
-                        url=get_image_url(image_filename),
-                        page=page_num + 1,
-                        index=img_index + 1,
-                        filename=image_filename,
-                        document_id=document_id
-                    )
+        Args:
+            path (str): Path to the PDF file
+            document_id (str): ID of the document in the database
+
+        Returns:
+            Tuple[TextData, List[ImageLink], TableData]: Extracted text, image links and tables
+        """
+        with _open_pdf(path) as doc:
+            page_count = len(doc)
+
+        workers = _extraction_process_count()
+        image_folder = settings.IMAGE_FOLDER
+        # Worker processes load their own settings, so pass the options along
+        convert_images = settings.CONVERT_NON_WEB_IMAGES
+
+        if workers > 1 and page_count >= settings.PARALLEL_EXTRACTION_MIN_PAGES:
+            # One contiguous page range per worker, merged back in page order
+            chunk_size = math.ceil(page_count / workers)
+            results = _run_in_process_pool(_extract_pages_chunk, [
+                (path, start, min(start + chunk_size, page_count), document_id, image_folder, convert_images)
+                for start in range(0, page_count, chunk_size)
+            ])
+        else:
+            results = [_extract_pages_chunk(path, 0, page_count, document_id, image_folder, convert_images)]
+
+        text_data = {}
+        image_links = []
+        table_data = {}
+        margin_blocks = {}
+        make_url = get_image_url
+        for chunk_text, chunk_images, chunk_tables, chunk_margins in results:
+            text_data.update(chunk_text)
+            table_data.update(chunk_tables)
+            margin_blocks.update(chunk_margins)
+            image_links.extend(
+                ImageLink(
+                    url=make_url(record["filename"]),
+                    document_id=document_id,
+                    **record
                 )
+                for record in chunk_images
+            )
+
+        if settings.USE_PDFPLUMBER_TABLE_FALLBACK:
+            missing_pages = [
+                page_num for page_num in range(page_count)
+                if f"Page {page_num + 1}" not in table_data
+            ]
+            if missing_pages:
+                table_data.update(PDFService._extract_tables_sync(path, missing_pages).pages)
+                # Keep pages in document order
+                table_data = {page: table_data[page] for page in text_data if page in table_data}
+
+        text = TextData(pages=text_data)
+        text._boilerplate = _find_boilerplate(margin_blocks, page_count)
 
-        doc.close()
-        return TextData(pages=text_data), image_links
+        return text, image_links, TableData(pages=table_data)
 
     @staticmethod
     async def extract_tables(file_info: FileInfo) -> TableData:
         """
-        Extract tables from a PDF file.
+        Extract tables from a PDF file with pdfplumber.
 
         Args:
             file_info (FileInfo): Information about the PDF file
@@ -76,16 +469,102 @@ class PDFService:
         Returns:
             TableData: Extracted table data
         """
-        tables = {}
+        return await asyncio.to_thread(PDFService._extract_tables_sync, file_info.path)
+
+    @staticmethod
+    def _extract_tables_sync(path: str, page_numbers: Optional[List[int]] = None) -> TableData:
+        """
+        Extract tables from a PDF file with pdfplumber, blocking the calling thread.
+
+        When many pages are checked they are split into chunks that are
+        extracted in the shared worker process pool; otherwise they are
+        extracted inline.
 
-        with pdfplumber.open(file_info.path) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                extracted_tables = page.extract_tables()
-                if extracted_tables:
-                    tables[f"Page {page_num + 1}"] = extracted_tables
+        Args:
+            path (str): Path to the PDF file
+            page_numbers (Optional[List[int]]): Zero-based pages to check; all pages when None
+
+        Returns:
+            TableData: Extracted table data
+        """
+        workers = _extraction_process_count()
+
+        with pdfplumber.open(path) as pdf:
+            if page_numbers is None:
+                page_numbers = list(range(len(pdf.pages)))
+
+            if workers <= 1 or len(page_numbers) < settings.PARALLEL_EXTRACTION_MIN_PAGES:
+                return TableData(pages=_extract_page_tables(pdf, page_numbers))
+
+        # Every chunk reopens the document, so keep chunks at least a few pages long
+        chunk_size = max(4, math.ceil(len(page_numbers) / workers))
+        results = _run_in_process_pool(_extract_tables_chunk, [
+            (path, page_numbers[start:start + chunk_size])
+            for start in range(0, len(page_numbers), chunk_size)
+        ])
+
+        # Chunks are in page order, so merging keeps pages in document order
+        tables = {}
+        for chunk_tables in results:
+            tables.update(chunk_tables)
 
         return TableData(pages=tables)
 
+    @staticmethod
+    def _content_digest(file_info: FileInfo) -> Optional[str]:
+        """
+        Build the versioned content key for an uploaded file.
+
+        Args:
+            file_info (FileInfo): Information about the PDF file
+
+        Returns:
+            Optional[str]: Content key, or None if the file was not hashed
+        """
+        if not file_info.content_digest:
+            return None
+        return f"{file_info.content_digest}:v{EXTRACTION_VERSION}"
+
+    @classmethod
+    def _find_processed_sync(
+        cls,
+        db: Session,
+        file_info: FileInfo,
+        content_digest: str
+    ) -> Optional[PDFExtractResponse]:
+        """
+        Find an earlier extraction of the same file, blocking the calling thread.
+
+        Only documents whose files are still inside the retention window are
+        reused; the cleanup worker deletes files, not database records.
+
+        Args:
+            db (Session): Database session
+            file_info (FileInfo): Information about the uploaded PDF file
+            content_digest (str): Versioned content key of the file
+
+        Returns:
+            Optional[PDFExtractResponse]: The earlier extraction, or None if there is none
+        """
+        # Leave a minute of slack so the cleanup job cannot remove files we return
+        window = max(settings.FILE_RETENTION_MINUTES - 1, 0)
+        created_after = datetime.datetime.now() - datetime.timedelta(minutes=window)
+
+        document = PDFRepository.get_by_digest(db, content_digest, created_after)
+        if not document:
+            return None
+
+        logger.info("Reusing extraction of document %s for %s", document.id, file_info.filename)
+
+        # The new upload is redundant unless it replaced the stored file
+        if os.path.basename(file_info.path) != document.filename:
+            try:
+                os.remove(file_info.path)
+            except OSError as e:
+                logger.warning(f"Could not remove duplicate upload {file_info.path}: {str(e)}")
+
+        return cls._build_response(document)
+
     @classmethod
     async def process_pdf(
         cls,
@@ -104,20 +583,37 @@ class PDFService:
         Returns:
             PDFExtractResponse: Processed PDF data with database IDs
         """
+        # Reuse the results of an earlier upload of the same file
+        content_digest = cls._content_digest(file_info)
+        if content_digest:
+            existing = await asyncio.to_thread(cls._find_processed_sync, db, file_info, content_digest)
+            if existing:
+                if include_summary:
+                    existing.summary = await cls.generate_summary(existing.text)
+                return existing
+
         # Create document in database
-        document = PDFRepository.create_document(db, file_info)
+        document = await asyncio.to_thread(PDFRepository.create_document, db, file_info)
         document_id = document.id
+        # Read before later commits expire the instance
+        created_at = document.created_at
+
+        # Keep concurrent uploads from thrashing the disk; the slot is released
+        # before summarizing, so slow LLM calls do not hold up other extractions
+        async with _get_extraction_semaphore():
+            # Extract text, images and tables in a single pass over the document
+            text_data, image_links, table_data = await cls.extract_text_and_images(file_info, document_id)
+
+            # Save extracted data to database in a single transaction; the digest is
+            # only recorded with it, so failed extractions are never reused
+            image_rows = list(map(attrgetter("page", "index", "filename"), image_links))
+            await asyncio.to_thread(
+                PDFRepository.save_all, db, document_id, text_data.pages, image_rows, table_data.pages,
+                content_digest, text_data._boilerplate
+            )
 
-        # Extract data from PDF
-        text_data, image_links = await cls.extract_text_and_images(file_info, document_id)
-        table_data = await cls.extract_tables(file_info)
-
-        # Save extracted data to database
-        PDFRepository.save_text_content(db, document_id, text_data.pages)
-        PDFRepository.save_images(db, document_id, [img.dict() for img in image_links])
-
-        if table_data.pages:
-            PDFRepository.save_tables(db, document_id, table_data.pages)
+        # Cached listing pages no longer include every document
+        document_list_cache.clear()
 
         # Generate LLM summary if requested
         summary = None
@@ -132,14 +628,87 @@ class PDFService:
             tables=table_data,
             images=image_links,
             summary=summary,
-            created_at=document.created_at
+            created_at=created_at
         )
 
+    @staticmethod
+    def _iter_chunks(
+        pages: Dict[str, str],
+        max_size: int,
+        boilerplate: Optional[Dict[str, List[str]]] = None,
+        size: Callable[[str], int] = len
+    ) -> Iterator[str]:
+        """
+        Group page texts into chunks of at most max_size, as measured by size.
+
+        Pages are never split; a single page larger than max_size becomes its
+        own chunk. Pages without text are skipped.
+
+        Args:
+            pages (Dict[str, str]): Page text keyed by page name
+            max_size (int): Target maximum chunk size
+            boilerplate (Optional[Dict[str, List[str]]]): Header/footer blocks to drop, keyed by page name
+            size (Callable[[str], int]): Measure of a text, e.g. characters or tokens
+
+        Yields:
+            str: Chunk text with each page prefixed by its name
+        """
+        parts = []
+        total = 0
+        separator = size("\n\n")
+        boilerplate = boilerplate or {}
+
+        for page_name, content in pages.items():
+            for block in boilerplate.get(page_name, ()):
+                content = content.replace(block, "", 1)
+
+            if not content or not content.strip():
+                continue
+
+            part = f"{page_name}:\n{content}"
+            part_size = size(part)
+            if parts and total + part_size > max_size:
+                yield "\n\n".join(parts)
+                parts = []
+                total = 0
+
+            parts.append(part)
+            total += part_size + separator
+
+        if parts:
+            yield "\n\n".join(parts)
+
+    @classmethod
+    def _summary_chunks(cls, text_data: TextData) -> List[str]:
+        """
+        Split extracted text into summarization inputs, blocking the calling thread.
+
+        Chunks are sized in the unit the LLM input is truncated in (tokens
+        when a tokenizer is available), so token-dense text such as CJK or
+        numeric tables is not cut short before summarization.
+
+        Args:
+            text_data (TextData): The extracted text data from the PDF
+
+        Returns:
+            List[str]: At most SUMMARY_MAX_CHUNKS chunk texts
+        """
+        max_size, size = LLMService.input_budget()
+        # Running headers and footers only repeat on every page, so leave them out
+        return list(islice(
+            cls._iter_chunks(text_data.pages, max_size, text_data._boilerplate, size),
+            SUMMARY_MAX_CHUNKS
+        ))
+
     @classmethod
     async def generate_summary(cls, text_data: TextData) -> Optional[str]:
         """
         Generate an LLM summary from extracted text data.
 
+        Documents that fit in a single LLM input are summarized directly.
+        Longer ones are summarized chunk by chunk (map) and the partial
+        summaries are then summarized together (reduce).
+
         Args:
             text_data: The extracted text data from the PDF
 
@@ -147,18 +716,34 @@ class PDFService:
             Summary string or None if generation fails
         """
         try:
-            # Combine all page text into a single document
-            full_text = "\n\n".join(
-                f"{page_name}:\n{content}"
-                for page_name, content in text_data.pages.items()
-            )
+            # Chunks match the LLM input budget, so short documents need a single call
+            chunks = await asyncio.to_thread(cls._summary_chunks, text_data)
 
-            if not full_text.strip():
+            if not chunks:
                 logger.warning("No text content available for summarization")
                 return None
 
-            summary = await LLMService.summarize_text(full_text)
-            return summary
+            if len(chunks) == 1:
+                return await LLMService.summarize_text(chunks[0])
+
+            # Bound concurrent LLM calls for this document
+            semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+            async def summarize_chunk(chunk: str) -> Optional[str]:
+                async with semaphore:
+                    return await LLMService.summarize_text(chunk)
+
+            partial_summaries = await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks))
+            partial_summaries = [summary for summary in partial_summaries if summary]
+
+            if not partial_summaries:
+                return None
+
+            combined = "\n\n".join(
+                f"Part {index}:\n{summary}"
+                for index, summary in enumerate(partial_summaries, start=1)
+            )
+            return await LLMService.summarize_text(combined)
 
         except Exception as e:
             logger.error(f"Error generating PDF summary: {str(e)}")
@@ -176,48 +761,130 @@ class PDFService:
         Returns:
             PDFExtractResponse: Processed PDF data
         """
+        # Fetching and rebuilding the response both block, so do them in a worker thread
+        return await asyncio.to_thread(cls._get_pdf_by_id_sync, db, document_id)
+
+    @staticmethod
+    def _get_pdf_by_id_sync(db: Session, document_id: str) -> Optional[PDFExtractResponse]:
+        """
+        Get processed PDF data by document ID, blocking the calling thread.
+
+        Args:
+            db (Session): Database session
+            document_id (str): Document ID
+
+        Returns:
+            Optional[PDFExtractResponse]: Processed PDF data, or None if not found
+        """
         # Get document with all relations
         document = PDFRepository.get_document_with_relations(db, document_id)
 
         if not document:
             return None
 
+        return PDFService._build_response(document)
+
+    @staticmethod
+    async def stream_pdf_content(db: Session, document: PDFDocument) -> AsyncIterator[bytes]:
+        """
+        Stream a processed PDF as newline-delimited JSON.
+
+        The first line describes the document; it is followed by one line per
+        text page, table and image link. Rows are fetched and emitted in
+        batches, so memory use does not grow with the size of the document.
+
+        Args:
+            db (Session): Database session
+            document (PDFDocument): The stored document
+
+        Yields:
+            bytes: One batch of JSON lines
+        """
+        document_id = document.id
+        yield orjson.dumps({
+            "type": "document",
+            "id": document_id,
+            "filename": document.original_filename,
+            "created_at": document.created_at,
+        }) + b"\n"
+
+        batches = PDFRepository.iter_document_rows(db, document_id, batch_size=STREAM_BATCH_SIZE)
+        while True:
+            # Each batch is fetched from the database in a worker thread
+            batch = await asyncio.to_thread(next, batches, None)
+            if batch is None:
+                break
+
+            kind, rows = batch
+            if kind == "text":
+                lines = [
+                    {"type": "text", "page": page, "content": content}
+                    for page, content in rows
+                ]
+            elif kind == "table":
+                lines = [
+                    {"type": "table", "page": page, "index": index, "data": orjson.loads(data)}
+                    for page, index, data in rows
+                ]
+            else:
+                lines = [
+                    {
+                        "type": "image",
+                        "page": page,
+                        "index": index,
+                        "filename": filename,
+                        "url": get_image_url(filename),
+                    }
+                    for page, index, filename in rows
+                ]
+
+            yield b"".join(orjson.dumps(line) + b"\n" for line in lines)
+
+    @staticmethod
+    def _build_response(document: PDFDocument) -> PDFExtractResponse:
+        """
+        Rebuild the extraction response from a stored document.
+
+        Args:
+            document (PDFDocument): Document with its relations loaded
+
+        Returns:
+            PDFExtractResponse: Processed PDF data
+        """
+        document_id = document.id
+
         # Reconstruct text data
-        text_pages = {}
-        for text in document.text_contents:
-            text_pages[f"Page {text.page_number}"] = text.content
+        text_pages = {f"Page {text.page_number}": text.content for text in document.text_contents}
 
         # Reconstruct tables data
-        table_pages = {}
+        table_pages = defaultdict(list)
         for table in document.tables:
-            page_key = f"Page {table.page_number}"
-            if page_key not in table_pages:
-                table_pages[page_key] = []
-
-            import json
-            table_data = json.loads(table.table_data)
-            table_pages[page_key].append(table_data)
+            table_pages[f"Page {table.page_number}"].append(orjson.loads(table.table_data))
 
         # Reconstruct image links
-        image_links = []
-        for img in document.images:
-            image_links.append(
-                ImageLink(
-                    url=get_image_url(img.filename),
-                    page=img.page_number,
-                    index=img.image_index,
-                    filename=img.filename,
-                    document_id=document_id
-                )
+        image_links = [
+            ImageLink(
+                url=get_image_url(img.filename),
+                page=img.page_number,
+                index=img.image_index,
+                filename=img.filename,
+                document_id=document_id
             )
+            for img in document.images
+        ]
+
+        # Reused extractions leave the same headers and footers out of summaries
+        text_data = TextData(pages=text_pages)
+        if document.boilerplate:
+            text_data._boilerplate = orjson.loads(document.boilerplate)
 
         # Return response model
         return PDFExtractResponse(
             id=document_id,
             filename=document.original_filename,
-            text=TextData(pages=text_pages),
-            tables=TableData(pages=table_pages),
+            text=text_data,
+            tables=TableData(pages=dict(table_pages)),
             images=image_links,
             summary=None,  # Summary is not stored, regenerate if needed
             created_at=document.created_at
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,258 @@
+import hashlib
+import heapq
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, Optional, Set
+
+from app.config import settings
+
+
+class TTLCache:
+    """Thread-safe in-memory cache whose entries expire after a fixed time."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024, max_size: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds (float): How long an entry stays valid (in seconds)
+            max_entries (int): Maximum number of entries before the oldest are evicted
+            max_size (Optional[int]): Maximum total size of the entries, as reported to set();
+                values larger than this are not cached
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _pop(self, key: Hashable) -> None:
+        """Remove an entry and release its size; the lock must be held."""
+        self._size -= self._entries.pop(key)[2]
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key (Hashable): Cache key
+
+        Returns:
+            Optional[Any]: The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, size: int = 0) -> None:
+        """
+        Store a value in the cache.
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to cache
+            size (int): Approximate size of the value, counted against max_size
+        """
+        if self.ttl_seconds <= 0:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+
+            if self.max_size is not None and size > self.max_size:
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, size)
+            self._size += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_size is not None and self._size > self.max_size
+            ):
+                self._pop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class NearDuplicateCache:
+    """
+    In-memory cache that matches texts which are almost, but not exactly, equal.
+
+    Each text is reduced to a bottom-k MinHash sketch of its word shingles;
+    a lookup returns the value of the most similar stored text whose
+    estimated Jaccard similarity reaches the threshold. Sketch hashes are
+    indexed, so a lookup only scores entries that share enough of them
+    instead of every stored text.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        threshold: float = 0.9,
+        sketch_size: int = 128,
+        shingle_size: int = 5,
+        max_entries: int = 1024
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds (float): How long an entry stays valid (in seconds)
+            threshold (float): Minimum estimated similarity (0-1) for a match
+            sketch_size (int): Number of hashes kept per text
+            shingle_size (int): Number of consecutive words per shingle
+            max_entries (int): Maximum number of entries before the oldest are evicted
+        """
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.sketch_size = sketch_size
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        # Sketch hash -> IDs of the entries whose sketch contains it
+        self._postings: Dict[int, Set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores entries at all."""
+        return self.ttl_seconds > 0
+
+    def _sketch(self, text: str) -> FrozenSet[int]:
+        """Compute the bottom-k MinHash sketch of a text."""
+        words = text.lower().split()
+        size = min(self.shingle_size, len(words)) or 1
+        hashes = {
+            int.from_bytes(
+                hashlib.blake2b(" ".join(words[i:i + size]).encode("utf-8"), digest_size=8).digest(),
+                "big"
+            )
+            for i in range(max(len(words) - size + 1, 1))
+        }
+        return frozenset(heapq.nsmallest(self.sketch_size, hashes))
+
+    def _similarity(self, a: FrozenSet[int], b: FrozenSet[int]) -> float:
+        """Estimate the Jaccard similarity of two sketched texts."""
+        union = heapq.nsmallest(self.sketch_size, a | b)
+        if not union:
+            return 0.0
+        shared = sum(1 for value in union if value in a and value in b)
+        return shared / len(union)
+
+    def _remove(self, entry_id: int) -> None:
+        """Remove an entry and its index postings; the lock must be held."""
+        _, _, sketch, _ = self._entries.pop(entry_id)
+        for value in sketch:
+            postings = self._postings[value]
+            postings.discard(entry_id)
+            if not postings:
+                del self._postings[value]
+
+    def get(self, namespace: Hashable, text: str) -> Optional[Any]:
+        """
+        Get the value cached for the most similar text.
+
+        Args:
+            namespace (Hashable): Only entries stored under the same namespace match
+            text (str): Text to look up
+
+        Returns:
+            Optional[Any]: The cached value, or None if no stored text is similar enough
+        """
+        if not self.enabled:
+            return None
+
+        sketch = self._sketch(text)
+        # The estimate can only reach the threshold if this many sketch hashes are shared
+        min_shared = math.ceil(self.threshold * len(sketch))
+        now = time.monotonic()
+        best_value, best_score = None, 0.0
+
+        with self._lock:
+            shared_counts = Counter()
+            for value in sketch:
+                shared_counts.update(self._postings.get(value, ()))
+
+            for entry_id, shared in shared_counts.items():
+                if shared < min_shared:
+                    continue
+
+                expires_at, entry_namespace, entry_sketch, value = self._entries[entry_id]
+                if expires_at <= now:
+                    self._remove(entry_id)
+                    continue
+                if entry_namespace != namespace:
+                    continue
+
+                score = self._similarity(sketch, entry_sketch)
+                if score >= self.threshold and score > best_score:
+                    best_value, best_score = value, score
+
+        return best_value
+
+    def set(self, namespace: Hashable, text: str, value: Any) -> None:
+        """
+        Store a value for a text.
+
+        Args:
+            namespace (Hashable): Namespace the entry belongs to
+            text (str): Text the value was computed from
+            value (Any): Value to cache
+        """
+        if self.ttl_seconds <= 0:
+            return
+
+        sketch = self._sketch(text)
+
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (time.monotonic() + self.ttl_seconds, namespace, sketch, value)
+            for hash_value in sketch:
+                self._postings.setdefault(hash_value, set()).add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+
+
+# Processed documents do not change after extraction; sized by their text, so a
+# burst of large documents cannot pin unbounded memory in every worker process
+document_cache = TTLCache(
+    ttl_seconds=settings.DOCUMENT_CACHE_TTL_SECONDS,
+    max_size=settings.DOCUMENT_CACHE_MAX_CHARS,
+)
+
+# Listing pages change whenever a document is added
+document_list_cache = TTLCache(ttl_seconds=settings.DOCUMENT_LIST_CACHE_TTL_SECONDS)
+
+# LLM summaries keyed by model and content hash
+summary_cache = TTLCache(ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS)
+
+# LLM summaries of near-identical texts (e.g. re-issued versions of a document)
+similar_summary_cache = NearDuplicateCache(
+    ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS if settings.NEAR_DUPLICATE_SUMMARIES else 0,
+    threshold=settings.NEAR_DUPLICATE_THRESHOLD,
+)
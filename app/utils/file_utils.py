@@ -1,9 +1,165 @@
+import asyncio
+import hashlib
+import logging
 import os
-import shutil
+import queue
+import threading
+from typing import BinaryIO, Optional
 from fastapi import UploadFile
 from app.config import settings
 from app.models.schemas import FileInfo
 
+logger = logging.getLogger(__name__)
+
+# Read uploads in fixed-size chunks so memory use does not grow with file size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Maximum number of queued writes before producers wait for the writer thread
+WRITE_QUEUE_SIZE = 64
+
+# Maximum number of queued bytes before producers wait for the writer thread
+WRITE_QUEUE_MAX_BYTES = 32 * 1024 * 1024
+
+# Flags for creating or replacing a file for raw writes
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _copy_to_disk(source: BinaryIO, file_path: str) -> str:
+    """
+    Copy a file object to disk chunk by chunk, hashing it on the way.
+
+    Args:
+        source (BinaryIO): The file object to read from
+        file_path (str): The destination path
+
+    Returns:
+        str: Hex blake2b digest of the copied content
+    """
+    digest = hashlib.blake2b()
+
+    with open(file_path, "wb") as buffer:
+        while True:
+            chunk = source.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            buffer.write(chunk)
+
+    return digest.hexdigest()
+
+
+def write_file(file_path: str, data: bytes) -> None:
+    """
+    Write bytes to a file with raw os-level calls.
+
+    Args:
+        file_path (str): The destination path
+        data (bytes): The content to write
+    """
+    fd = os.open(file_path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        # os.write may write fewer bytes than requested
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+class BackgroundFileWriter:
+    """
+    Write files from a single background thread.
+
+    Lets the caller keep producing data (e.g. extracting the next page)
+    while earlier writes hit the disk. The queue is bounded both by item
+    count and by total bytes, so a slow disk applies back-pressure instead
+    of buffering every image in memory.
+    """
+
+    def __init__(self, max_pending: int = WRITE_QUEUE_SIZE, max_pending_bytes: int = WRITE_QUEUE_MAX_BYTES):
+        """
+        Start the writer thread.
+
+        Args:
+            max_pending (int): Maximum number of writes waiting in the queue
+            max_pending_bytes (int): Maximum number of bytes waiting in the queue;
+                a single larger write is still accepted when the queue is empty
+        """
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._max_pending_bytes = max_pending_bytes
+        self._pending_bytes = 0
+        self._space = threading.Condition()
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, name="file-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, file_path: str, data: bytes) -> None:
+        """
+        Queue a file to be written.
+
+        Args:
+            file_path (str): The destination path
+            data (bytes): The content to write
+
+        Raises:
+            Exception: The error of an earlier failed write, usually an OSError
+        """
+        if self._error is not None:
+            raise self._error
+
+        size = len(data)
+        with self._space:
+            while self._pending_bytes and self._pending_bytes + size > self._max_pending_bytes:
+                self._space.wait()
+            self._pending_bytes += size
+
+        self._queue.put((file_path, data))
+
+    def close(self) -> None:
+        """
+        Wait for all queued writes to finish.
+
+        Raises:
+            Exception: The error of the first failed write, usually an OSError
+        """
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "BackgroundFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Let the original exception propagate
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            file_path, data = item
+
+            # Keep draining after a failure, and whatever a write raises, so
+            # producers waiting for queue space never block forever
+            try:
+                if self._error is None:
+                    write_file(file_path, data)
+            except Exception as e:
+                logger.exception(f"Error writing {file_path}")
+                self._error = e
+            finally:
+                with self._space:
+                    self._pending_bytes -= len(data)
+                    self._space.notify_all()
+
 
 async def save_upload_file(file: UploadFile) -> FileInfo:
     """
@@ -17,11 +173,10 @@ async def save_upload_file(file: UploadFile) -> FileInfo:
     """
     file_path = os.path.join(settings.UPLOAD_FOLDER, file.filename)
 
-    # Save the file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Save the file without blocking the event loop
+    content_digest = await asyncio.to_thread(_copy_to_disk, file.file, file_path)
 
-    return FileInfo(filename=file.filename, path=file_path)
+    return FileInfo(filename=file.filename, path=file_path, content_digest=content_digest)
 
 
 def get_image_url(filename: str) -> str:
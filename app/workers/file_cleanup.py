@@ -115,39 +115,5 @@ class FileCleanupWorker:
 
 
 # Create a single instance of the worker
-try:
-    # First try to get the value directly from settings
-    retention_minutes = getattr(settings, 'FILE_RETENTION_MINUTES', 10)
-    print(f"Config FILE_RETENTION_MINUTES value: {retention_minutes}")
-
-    # Check for environment variable directly
-    env_retention = os.environ.get('FILE_RETENTION_MINUTES')
-    print(f"Environment FILE_RETENTION_MINUTES value: {env_retention}")
-
-    # If environment variable exists, use that value
-    if env_retention:
-        try:
-            retention_minutes = int(env_retention)
-            print(f"Using retention minutes from environment: {retention_minutes}")
-        except ValueError:
-            print(f"Could not convert environment value to int: {env_retention}")
-
-    # Print all environment variables for debugging
-    print("All environment variables:")
-    for key, value in os.environ.items():
-        if "RETENTION" in key or "FILE" in key:
-            print(f"  {key}: {value}")
-
-    # Print all settings attributes
-    print("All settings attributes:")
-    for attr in dir(settings):
-        if not attr.startswith('_') and attr.isupper():
-            print(f"  {attr}: {getattr(settings, attr)}")
-
-    file_cleanup_worker = FileCleanupWorker(retention_minutes=retention_minutes)
-    print(f"Created file cleanup worker with retention minutes: {retention_minutes}")
-except Exception as e:
-    logger.error(f"Error initializing file cleanup worker: {str(e)}")
-    # Use default retention period
-    file_cleanup_worker = FileCleanupWorker(retention_minutes=10)
-    print("Created file cleanup worker with default retention minutes: 10")
\ No newline at end of file
+# Settings already resolve FILE_RETENTION_MINUTES from the environment and .env once at import
+file_cleanup_worker = FileCleanupWorker(retention_minutes=settings.FILE_RETENTION_MINUTES)
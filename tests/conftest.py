@@ -11,6 +11,18 @@ from app.database.models import Base
 from app.config import Settings
 from app.main import app
 from app.database.connection import get_db
+from app.utils.cache import document_cache, document_list_cache, similar_summary_cache, summary_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Make sure cached responses and summaries do not leak between tests."""
+    caches = (document_cache, document_list_cache, summary_cache, similar_summary_cache)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
 
 
 @pytest.fixture
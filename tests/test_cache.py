@@ -0,0 +1,109 @@
+from unittest.mock import patch
+
+from app.utils.cache import TTLCache, NearDuplicateCache
+
+
+def test_cache_get_and_set():
+    """Test storing and reading cached values."""
+    cache = TTLCache(ttl_seconds=60)
+
+    assert cache.get("key") is None
+
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    cache.clear()
+    assert cache.get("key") is None
+
+
+def test_cache_entries_expire():
+    """Test that entries are dropped once their TTL has passed."""
+    cache = TTLCache(ttl_seconds=10)
+
+    with patch("app.utils.cache.time.monotonic", return_value=100.0):
+        cache.set("key", "value")
+
+    with patch("app.utils.cache.time.monotonic", return_value=105.0):
+        assert cache.get("key") == "value"
+
+    with patch("app.utils.cache.time.monotonic", return_value=111.0):
+        assert cache.get("key") is None
+
+
+def test_cache_evicts_oldest_entries():
+    """Test that the cache stays within its size limit."""
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    # "b" was the least recently used entry
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_evicts_by_total_size():
+    """Test that the cache stays within its total size and skips oversized values."""
+    cache = TTLCache(ttl_seconds=60, max_size=10)
+
+    cache.set("a", "aaaa", size=4)
+    cache.set("b", "bbbb", size=4)
+    cache.set("c", "cccc", size=4)
+
+    # "a" was evicted to make room for "c"
+    assert cache.get("a") is None
+    assert cache.get("b") == "bbbb"
+    assert cache.get("c") == "cccc"
+
+    # A value larger than the whole cache is not stored and evicts nothing
+    cache.set("big", "x" * 11, size=11)
+    assert cache.get("big") is None
+    assert cache.get("b") == "bbbb"
+
+    # Replacing an entry releases its old size
+    cache.set("b", "b", size=1)
+    cache.set("d", "dddd", size=4)
+    assert cache.get("b") == "b"
+    assert cache.get("c") == "cccc"
+    assert cache.get("d") == "dddd"
+
+
+def test_cache_disabled_with_zero_ttl():
+    """Test that a zero TTL disables caching."""
+    cache = TTLCache(ttl_seconds=0)
+
+    cache.set("key", "value")
+    assert cache.get("key") is None
+
+
+def test_near_duplicate_cache_matches_similar_text():
+    """Test that a slightly edited text finds the value of the original."""
+    cache = NearDuplicateCache(ttl_seconds=60, threshold=0.8)
+    original = " ".join(f"word{i}" for i in range(500))
+    edited = original.replace("word250", "changed", 1)
+    unrelated = " ".join(f"other{i}" for i in range(500))
+
+    cache.set("model", original, "summary")
+
+    assert cache.get("model", edited) == "summary"
+    assert cache.get("model", unrelated) is None
+
+    # Entries from another namespace never match
+    assert cache.get("other-model", original) is None
+
+
+def test_near_duplicate_cache_eviction_updates_index():
+    """Test that evicted entries no longer match and leave no index entries behind."""
+    cache = NearDuplicateCache(ttl_seconds=60, max_entries=2)
+    texts = [" ".join(f"doc{n}word{i}" for i in range(200)) for n in range(3)]
+
+    for n, text in enumerate(texts):
+        cache.set("model", text, f"summary {n}")
+
+    # The oldest entry was evicted, the newer ones still match
+    assert cache.get("model", texts[0]) is None
+    assert cache.get("model", texts[2]) == "summary 2"
+    assert set().union(*cache._postings.values()) == set(cache._entries)
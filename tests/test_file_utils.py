@@ -1,12 +1,15 @@
+import hashlib
+import io
 import os
 import pytest
 from fastapi import UploadFile
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from app.utils.file_utils import save_upload_file, get_image_url, parse_image_filename
+from app.utils.file_utils import save_upload_file, get_image_url, parse_image_filename, BackgroundFileWriter
 from app.config import settings
 
 
+@pytest.mark.asyncio
 async def test_save_upload_file(temp_dir, monkeypatch):
     """Test saving an uploaded file."""
     # Mock the settings
@@ -16,8 +19,8 @@ async def test_save_upload_file(temp_dir, monkeypatch):
     mock_file = MagicMock(spec=UploadFile)
     mock_file.filename = "test.pdf"
 
-    # Create a mock file-like object
-    mock_file.file.read.return_value = b"test content"
+    # Create a file-like object
+    mock_file.file = io.BytesIO(b"test content")
 
     # Save the file
     file_info = await save_upload_file(mock_file)
@@ -34,6 +37,9 @@ async def test_save_upload_file(temp_dir, monkeypatch):
         content = f.read()
         assert content == b"test content"
 
+    # The content was hashed while it was copied
+    assert file_info.content_digest == hashlib.blake2b(b"test content").hexdigest()
+
 
 def test_get_image_url(monkeypatch):
     """Test generating an image URL."""
@@ -65,4 +71,57 @@ def test_parse_image_filename():
     # Check result
     assert document_id == "550e8400-e29b-41d4-a716-446655440000"
     assert page_num == 3
-    assert img_index == 1
\ No newline at end of file
+    assert img_index == 1
+
+
+def test_background_file_writer(temp_dir):
+    """Test that queued files are all written once the writer is closed."""
+    contents = {f"image_{i}.png": os.urandom(1024) for i in range(10)}
+
+    with BackgroundFileWriter(max_pending=2) as writer:
+        for filename, data in contents.items():
+            writer.write(os.path.join(temp_dir, filename), data)
+
+    for filename, data in contents.items():
+        with open(os.path.join(temp_dir, filename), "rb") as f:
+            assert f.read() == data
+
+
+def test_background_file_writer_limits_pending_bytes(temp_dir):
+    """Test that writes larger than the byte budget still go through one at a time."""
+    contents = {f"image_{i}.png": os.urandom(4096) for i in range(5)}
+
+    with BackgroundFileWriter(max_pending_bytes=1024) as writer:
+        for filename, data in contents.items():
+            writer.write(os.path.join(temp_dir, filename), data)
+
+    for filename, data in contents.items():
+        with open(os.path.join(temp_dir, filename), "rb") as f:
+            assert f.read() == data
+
+
+def test_background_file_writer_reports_errors(temp_dir):
+    """Test that a failed write is raised when the writer is closed."""
+    writer = BackgroundFileWriter()
+    writer.write(os.path.join(temp_dir, "missing", "image.png"), b"data")
+
+    with pytest.raises(OSError):
+        writer.close()
+
+
+def test_background_file_writer_survives_unexpected_errors(temp_dir):
+    """Test that a write failing with a non-OS error does not stop the writer thread."""
+    with patch("app.utils.file_utils.write_file", side_effect=[ValueError("bad data"), None, None]) as mock_write:
+        writer = BackgroundFileWriter(max_pending=1, max_pending_bytes=4)
+        writer.write(os.path.join(temp_dir, "image_1.png"), b"data")
+
+        # Waits for the failed write to release its bytes instead of hanging
+        with pytest.raises(ValueError):
+            for i in range(2, 5):
+                writer.write(os.path.join(temp_dir, f"image_{i}.png"), b"data")
+
+        with pytest.raises(ValueError):
+            writer.close()
+
+    # Writes after the failure are skipped
+    mock_write.assert_called_once()
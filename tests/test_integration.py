@@ -1,10 +1,13 @@
+import asyncio
 import os
 import json
 import pytest
+import threading
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 
 from app.main import app
+from app.config import settings
 from app.services.pdf_service import PDFService
 from app.models.schemas import PDFExtractResponse, TextData, TableData
 from app.database.models import PDFDocument, TextContent, Image, Table
@@ -28,6 +31,43 @@ def test_health_check(test_client):
     assert response.json()["status"] == "healthy"
 
 
+def test_process_time_header(test_client):
+    """Test that responses carry the request processing time."""
+    response = test_client.get("/health")
+
+    assert response.status_code == 200
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+
+def test_unhandled_error_returns_json(test_client, caplog):
+    """Test that unexpected errors return a generic JSON 500, also with debug enabled."""
+    assert app.debug
+
+    with patch("app.controllers.worker_controller.LLMService.is_available", side_effect=RuntimeError("boom")):
+        response = test_client.get(f"{settings.API_PREFIX}/llm/status")
+
+    assert response.status_code == 500
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"detail": "Internal server error"}
+
+    # The error is logged with its traceback
+    assert "Error processing request" in caplog.text
+    assert "RuntimeError: boom" in caplog.text
+
+
+def test_blocking_executor_configured(test_client):
+    """Test that blocking work runs on the sized executor created at startup."""
+    from app import main
+
+    executor = main._blocking_executor
+    assert executor is not None
+    assert executor._max_workers == main._blocking_thread_count()
+
+    # asyncio.to_thread uses the loop's default executor
+    thread_name = test_client.portal.call(asyncio.to_thread, lambda: threading.current_thread().name)
+    assert thread_name.startswith("pdf")
+
+
 def test_worker_status_endpoint(test_client):
     """Test the worker status endpoint."""
     # Create a mock FileCleanupWorker
@@ -182,18 +222,18 @@ def test_extract_endpoint_invalid_file(test_client, temp_dir):
     assert "Only PDF files are supported" in response.json()["detail"]
 
 
-def test_download_image_endpoint(test_client, temp_dir, monkeypatch):
-    """Test the download image endpoint."""
-    # Mock the settings
-    monkeypatch.setattr("app.controllers.pdf_controller.settings.IMAGE_FOLDER", temp_dir)
-
-    # Create a test image
-    image_path = os.path.join(temp_dir, "test_image.png")
+def test_download_image_endpoint(test_client):
+    """Test downloading an image from the image folder."""
+    # Create a test image in the served folder
+    image_path = os.path.join(settings.IMAGE_FOLDER, "test_image.png")
     with open(image_path, "wb") as f:
         f.write(b"fake image data")
 
-    # Call the endpoint
-    response = test_client.get("/api/v1/images/test_image.png")
+    try:
+        # Call the endpoint
+        response = test_client.get("/api/v1/images/test_image.png")
+    finally:
+        os.remove(image_path)
 
     # Check response
     assert response.status_code == 200
@@ -201,18 +241,12 @@ def test_download_image_endpoint(test_client, temp_dir, monkeypatch):
     assert "image/png" in response.headers["content-type"]
 
 
-def test_download_image_not_found(test_client, temp_dir, monkeypatch):
-    """Test the download image endpoint with a non-existent image."""
-    # Mock the settings
-    monkeypatch.setattr("app.controllers.pdf_controller.settings.IMAGE_FOLDER", temp_dir)
-
-    # Call the endpoint
+def test_download_image_not_found(test_client):
+    """Test downloading a non-existent image."""
     response = test_client.get("/api/v1/images/non_existent_image.png")
 
     # Check response
     assert response.status_code == 404
-    assert "detail" in response.json()
-    assert "Image not found" in response.json()["detail"]
 
 
 def test_docs_endpoint(test_client):
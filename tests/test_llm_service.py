@@ -0,0 +1,175 @@
+import threading
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from app.services.llm_service import LLMService, MAX_INPUT_CHARS, MAX_INPUT_TOKENS, SYSTEM_MESSAGE
+from app.utils.cache import NearDuplicateCache
+
+
+@pytest.fixture(autouse=True)
+def reset_llm():
+    """Make sure every test starts without a cached LLM instance."""
+    LLMService.reset_llm()
+    yield
+    LLMService.reset_llm()
+
+
+def test_get_llm_creates_single_instance_under_concurrency():
+    """Test that concurrent callers share one LLM instance."""
+    barrier = threading.Barrier(8)
+    results = []
+
+    def create_llm():
+        return MagicMock()
+
+    def worker():
+        barrier.wait()
+        results.append(LLMService.get_llm())
+
+    with patch.object(LLMService, "_create_llm", side_effect=create_llm) as mock_create:
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # Only one client was created and every caller got it
+    mock_create.assert_called_once()
+    assert len(results) == 8
+    assert all(llm is results[0] for llm in results)
+
+
+@pytest.mark.asyncio
+async def test_summarize_text_uses_async_invoke():
+    """Test that summarization awaits the LLM instead of blocking on it."""
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content="  A short summary.  "))
+
+    with patch.object(LLMService, "get_llm", return_value=mock_llm):
+        summary = await LLMService.summarize_text("Some document text")
+
+    # Check the async API was used
+    assert summary == "A short summary."
+    mock_llm.ainvoke.assert_awaited_once()
+    mock_llm.invoke.assert_not_called()
+
+    # The shared system message is reused
+    messages = mock_llm.ainvoke.call_args[0][0]
+    assert messages[0] is SYSTEM_MESSAGE
+
+
+@pytest.mark.asyncio
+async def test_summarize_text_caches_by_content():
+    """Test that the same text is only sent to the LLM once."""
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content="A short summary."))
+
+    with patch.object(LLMService, "get_llm", return_value=mock_llm):
+        first = await LLMService.summarize_text("Some document text")
+        second = await LLMService.summarize_text("Some document text")
+        other = await LLMService.summarize_text("Another document")
+
+    # The repeated text was served from the cache
+    assert first == second == other == "A short summary."
+    assert mock_llm.ainvoke.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_summarize_text_reuses_near_duplicate_summary():
+    """Test that a near-identical document reuses the earlier summary when enabled."""
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content="A short summary."))
+
+    original = " ".join(f"word{i}" for i in range(500)) + " Printed on 2024-01-01"
+    reissued = original.replace("2024-01-01", "2024-06-30")
+
+    with patch("app.services.llm_service.similar_summary_cache", NearDuplicateCache(ttl_seconds=60)), \
+            patch.object(LLMService, "get_llm", return_value=mock_llm):
+        assert await LLMService.summarize_text(original) == "A short summary."
+        assert await LLMService.summarize_text(reissued) == "A short summary."
+
+    mock_llm.ainvoke.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_summarize_text_near_duplicates_off_by_default():
+    """Test that near-identical documents are summarized separately by default."""
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(side_effect=[
+        MagicMock(content="Alice owes 1000 EUR."),
+        MagicMock(content="Bob owes 98000 EUR."),
+    ])
+
+    template = " ".join(f"clause{i}" for i in range(500))
+    first = f"Invoice for Alice, 1000 EUR. {template}"
+    second = f"Invoice for Bob, 98000 EUR. {template}"
+
+    with patch.object(LLMService, "get_llm", return_value=mock_llm):
+        assert await LLMService.summarize_text(first) == "Alice owes 1000 EUR."
+        assert await LLMService.summarize_text(second) == "Bob owes 98000 EUR."
+
+
+def test_truncate_text_without_tokenizer(monkeypatch):
+    """Test that text is cut by characters when no tokenizer is available."""
+    monkeypatch.setattr("app.services.llm_service.settings.llm_provider", "ollama")
+
+    text = "word " * 10000
+    truncated = LLMService.truncate_text(text)
+
+    assert truncated == text[:MAX_INPUT_CHARS]
+
+
+def test_truncate_text_with_tokenizer():
+    """Test that text is cut to the token budget when a tokenizer is available."""
+    # Fake tokenizer: one token per character
+    mock_encoder = MagicMock()
+    mock_encoder.encode.side_effect = lambda text: list(text)
+    mock_encoder.decode.side_effect = lambda tokens: "".join(tokens)
+
+    with patch.object(LLMService, "_get_encoder", return_value=mock_encoder):
+        short_text = "a" * 10
+        long_text = "b" * (MAX_INPUT_TOKENS * 3)
+
+        assert LLMService.truncate_text(short_text) == short_text
+        assert LLMService.truncate_text(long_text) == "b" * MAX_INPUT_TOKENS
+
+
+def test_get_encoder_does_not_wait_for_loading(monkeypatch):
+    """Test that callers fall back to the character limit while the tokenizer is loading."""
+    monkeypatch.setattr("app.services.llm_service.settings.llm_provider", "openrouter")
+
+    # Another thread is loading (e.g. downloading) the tokenizer
+    with LLMService._encoder_lock:
+        assert LLMService._get_encoder() is None
+        text = "word " * 10000
+        assert LLMService.truncate_text(text) == text[:MAX_INPUT_CHARS]
+
+    # The result is not remembered, so a later call loads the tokenizer
+    assert not LLMService._encoder_loaded
+
+
+@pytest.mark.asyncio
+async def test_is_available_openrouter_checks_api_key(monkeypatch):
+    """Test that OpenRouter availability only depends on the API key."""
+    monkeypatch.setattr("app.services.llm_service.settings.llm_provider", "openrouter")
+    monkeypatch.setattr("app.services.llm_service.settings.OPENROUTER_API_KEY", "")
+
+    with patch.object(LLMService, "get_llm") as mock_get_llm:
+        assert await LLMService.is_available() is False
+
+    # No client was created for the check
+    mock_get_llm.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_is_available_caches_result(monkeypatch):
+    """Test that the Ollama probe result is reused within the TTL."""
+    monkeypatch.setattr("app.services.llm_service.settings.llm_provider", "ollama")
+
+    mock_head = AsyncMock(return_value=MagicMock(is_success=True))
+    with patch("app.services.llm_service.httpx.AsyncClient.head", mock_head):
+        assert await LLMService.is_available() is True
+        assert await LLMService.is_available() is True
+
+    # Only one probe request was sent
+    mock_head.assert_awaited_once()
@@ -1,15 +1,12 @@
-import os
 import pytest
 import json
 from unittest.mock import patch, MagicMock
 from fastapi import UploadFile, HTTPException
-from fastapi.responses import FileResponse
 from datetime import datetime
 
-from app.controllers.pdf_controller import extract_pdf, get_pdf_document, list_pdf_documents, download_image
+from app.controllers.pdf_controller import extract_pdf, get_pdf_document, list_pdf_documents, stream_pdf_document
 from app.models.schemas import PDFExtractResponse, TextData, TableData, PDFDocumentListResponse
 from app.database.models import PDFDocument
-from app.config import settings
 
 
 @pytest.mark.asyncio
@@ -50,6 +47,47 @@ async def test_extract_pdf_valid_file(test_pdf_file, db_session):
     assert response.text.pages["Page 1"] == "Test text"
 
 
+@pytest.mark.asyncio
+async def test_get_pdf_document_cached(db_session):
+    """Test that repeated lookups are served from the cache."""
+    mock_response = PDFExtractResponse(
+        id="test-doc-id",
+        filename="test.pdf",
+        text=TextData(pages={}),
+        tables=TableData(pages={}),
+        images=[],
+        created_at=datetime.now()
+    )
+
+    with patch("app.controllers.pdf_controller.PDFService.get_pdf_by_id", return_value=mock_response) as mock_get:
+        first = await get_pdf_document(document_id="test-doc-id", db=db_session)
+        second = await get_pdf_document(document_id="test-doc-id", db=db_session)
+
+    # Only the first call reached the service
+    mock_get.assert_called_once()
+    assert first is second
+
+
+@pytest.mark.asyncio
+async def test_get_pdf_document_too_large_to_cache(db_session, monkeypatch):
+    """Test that documents above the cache size limit are looked up every time."""
+    monkeypatch.setattr("app.controllers.pdf_controller.document_cache.max_size", 10)
+    mock_response = PDFExtractResponse(
+        id="test-doc-id",
+        filename="test.pdf",
+        text=TextData(pages={"Page 1": "Long page text"}),
+        tables=TableData(pages={}),
+        images=[],
+        created_at=datetime.now()
+    )
+
+    with patch("app.controllers.pdf_controller.PDFService.get_pdf_by_id", return_value=mock_response) as mock_get:
+        await get_pdf_document(document_id="test-doc-id", db=db_session)
+        await get_pdf_document(document_id="test-doc-id", db=db_session)
+
+    assert mock_get.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_extract_pdf_invalid_extension(db_session):
     """Test extracting content from a file with invalid extension."""
@@ -133,6 +171,18 @@ async def test_get_pdf_document_not_found(db_session):
     assert "Document with ID non-existent-id not found" in str(excinfo.value.detail)
 
 
+@pytest.mark.asyncio
+async def test_stream_pdf_document_not_found(db_session):
+    """Test streaming a non-existent PDF document."""
+    with patch("app.controllers.pdf_controller.PDFRepository.get_document", return_value=None):
+        with pytest.raises(HTTPException) as excinfo:
+            await stream_pdf_document(document_id="non-existent-id", db=db_session)
+
+    # The 404 is raised before the stream starts
+    assert excinfo.value.status_code == 404
+    assert "Document with ID non-existent-id not found" in str(excinfo.value.detail)
+
+
 @pytest.mark.asyncio
 async def test_list_pdf_documents(db_session):
     """Test listing PDF documents."""
@@ -145,7 +195,7 @@ async def test_list_pdf_documents(db_session):
     # Mock the list_documents method
     with patch("app.controllers.pdf_controller.PDFRepository.list_documents", return_value=mock_documents):
         # Mock the count query
-        with patch("app.controllers.pdf_controller.PDFRepository.list_documents", return_value=mock_documents):
+        with patch("app.controllers.pdf_controller.PDFRepository.count_documents", return_value=5):
             # Call the endpoint
             response = await list_pdf_documents(skip=0, limit=10, db=db_session)
 
@@ -160,41 +210,3 @@ async def test_list_pdf_documents(db_session):
     doc_ids = [doc.id for doc in response.documents]
     assert "doc-0" in doc_ids
     assert "doc-4" in doc_ids
-
-
-@pytest.mark.asyncio
-async def test_download_image_found(temp_dir, monkeypatch):
-    """Test downloading an image that exists."""
-    # Mock the settings
-    monkeypatch.setattr(settings, "IMAGE_FOLDER", temp_dir)
-
-    # Create a test image file
-    image_path = os.path.join(temp_dir, "test_image.png")
-    with open(image_path, "wb") as f:
-        f.write(b"fake image data")
-
-    # Mock the FileResponse class
-    with patch("app.controllers.pdf_controller.FileResponse", return_value="file_response") as mock_file_response:
-        # Call the endpoint
-        response = await download_image(filename="test_image.png")
-
-    # Check that FileResponse was called with the correct path
-    mock_file_response.assert_called_once_with(image_path)
-
-    # Check response
-    assert response == "file_response"
-
-
-@pytest.mark.asyncio
-async def test_download_image_not_found(temp_dir, monkeypatch):
-    """Test downloading a non-existent image."""
-    # Mock the settings
-    monkeypatch.setattr(settings, "IMAGE_FOLDER", temp_dir)
-
-    # Call the endpoint and check for exception
-    with pytest.raises(HTTPException) as excinfo:
-        await download_image(filename="non_existent_image.png")
-
-    # Check exception details
-    assert excinfo.value.status_code == 404
-    assert "Image not found: non_existent_image.png" in str(excinfo.value.detail)
\ No newline at end of file
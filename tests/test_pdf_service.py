@@ -1,12 +1,24 @@
 import os
+import fitz
 import pytest
 import json
-from unittest.mock import patch, MagicMock
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch, MagicMock, AsyncMock
 from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from app.models.schemas import FileInfo
-from app.services.pdf_service import PDFService
-from app.database.models import PDFDocument, TextContent, Image, Table
+from app.models.schemas import FileInfo, TableData, TextData
+from app.services.llm_service import LLMService, MAX_INPUT_TOKENS
+from app.services.pdf_service import (
+    PDFService, EXTRACTION_VERSION, _extract_pages_chunk, _extract_tables_chunk, _find_boilerplate, _open_pdf,
+    _get_extraction_semaphore, _run_in_process_pool
+)
+from app.database.models import Base, PDFDocument, TextContent, Image, Table
+from app.database.repository import PDFRepository
 
 
 @pytest.fixture
@@ -15,6 +27,23 @@ def sample_file_info(test_pdf_file):
     return FileInfo(filename="test.pdf", path=test_pdf_file)
 
 
+@pytest.fixture
+def threaded_db_session():
+    """Create a test database session that can be used from worker threads."""
+    # The service runs repository calls in worker threads, so share one connection across threads
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
 @pytest.mark.asyncio
 async def test_extract_text_and_images(sample_file_info, monkeypatch, temp_dir):
     """Test extracting text and images from a PDF."""
@@ -27,15 +56,26 @@ async def test_extract_text_and_images(sample_file_info, monkeypatch, temp_dir):
 
     # Mock the fitz.open method to avoid actual PDF processing
     mock_doc = MagicMock()
-    mock_page = MagicMock()
-    mock_page.get_text.return_value = "Test text content"
-    mock_doc.load_page.return_value = mock_page
 
-    # Mock page count
-    mock_doc.__len__.return_value = 1
-
-    # Mock get_images to return a single image
-    mock_page.get_images.return_value = [(0, 0, 0, 0, 0, 0, 0)]  # xref is first element
+    def load_page(page_num):
+        # Text blocks (x0, y0, x1, y1, text, block_no, block_type): a running
+        # header in the top margin, the page body and an image block
+        mock_page = MagicMock()
+        mock_page.rect = fitz.Rect(0, 0, 600, 800)
+        mock_page.get_text.return_value = [
+            (50, 20, 550, 40, "ACME Corp annual report\n", 0, 0),
+            (50, 100, 550, 400, f"Body of page {page_num + 1}\n", 1, 0),
+            (50, 400, 550, 600, "<image: DeviceRGB, width: 10, height: 10>", 2, 1),
+        ]
+        mock_page.find_tables.return_value.tables = []
+        # Mock get_images to return a single image
+        mock_page.get_images.return_value = [(0, 0, 0, 0, 0, 0, 0)]  # xref is first element
+        return mock_page
+
+    mock_doc.load_page.side_effect = load_page
+
+    # Mock page count; headers need to repeat on several pages to count as boilerplate
+    mock_doc.__len__.return_value = 3
 
     # Mock extract_image to return image data
     mock_doc.extract_image.return_value = {
@@ -50,21 +90,160 @@ async def test_extract_text_and_images(sample_file_info, monkeypatch, temp_dir):
             mock_pil_open.return_value = mock_image
 
             # Call the method
-            text_data, image_links = await PDFService.extract_text_and_images(sample_file_info, document_id)
+            text_data, image_links, table_data = await PDFService.extract_text_and_images(sample_file_info, document_id)
 
-    # Check text data
-    assert "Page 1" in text_data.pages
-    assert text_data.pages["Page 1"] == "Test text content"
+    # Check text data: the text blocks of each page, joined in order
+    assert list(text_data.pages) == ["Page 1", "Page 2", "Page 3"]
+    assert text_data.pages["Page 1"] == "ACME Corp annual report\nBody of page 1\n"
+    assert table_data.pages == {}
+
+    # The repeated header is recognized and left out of the summary input
+    assert text_data._boilerplate["Page 2"] == ["ACME Corp annual report\n"]
+    chunks = list(PDFService._iter_chunks(text_data.pages, 1000, text_data._boilerplate))
+    assert chunks == ["Page 1:\nBody of page 1\n\n\nPage 2:\nBody of page 2\n\n\nPage 3:\nBody of page 3\n"]
 
     # Check image links
-    assert len(image_links) == 1
+    assert len(image_links) == 3
     assert image_links[0].page == 1
     assert image_links[0].index == 1
     assert image_links[0].document_id == document_id
-    assert image_links[0].filename.startswith(f"{document_id}_page_0_image_1")
+    assert image_links[0].filename.startswith(f"{document_id}_page_1_image_1")
     assert image_links[0].url.startswith("/api/v1/images/")
 
 
+def test_open_pdf_memory_maps_file(test_pdf_file):
+    """Test opening a PDF from a memory map of the file."""
+    with _open_pdf(test_pdf_file) as doc:
+        assert len(doc) == 1
+        assert doc.load_page(0).get_text("text") == ""
+
+    # The document is closed on exit
+    assert doc.is_closed
+
+
+def test_extract_pages_chunk_writes_raw_image_bytes(sample_file_info, temp_dir):
+    """Test that extracted images are written without re-encoding."""
+    mock_doc = MagicMock()
+    mock_page = MagicMock()
+    mock_page.rect = fitz.Rect(0, 0, 600, 800)
+    mock_page.get_text.return_value = [
+        (50, 20, 550, 40, "ACME Corp\n", 0, 0),
+        (50, 100, 550, 700, "Test text content\n", 1, 0),
+        (50, 300, 550, 400, "<image: DeviceRGB, width: 10, height: 10, bpc: 8>", 2, 1),
+    ]
+    mock_page.get_images.return_value = [(7, 0, 0, 0, 0, 0, 0)]
+    mock_doc.load_page.return_value = mock_page
+    mock_doc.extract_image.return_value = {"image": b"\x89PNG raw bytes", "ext": "png"}
+
+    with patch("fitz.open", return_value=mock_doc):
+        text_data, image_records, table_data, margin_blocks = _extract_pages_chunk(
+            sample_file_info.path, 0, 1, "test-doc-id", temp_dir
+        )
+
+    # Text blocks are joined, image blocks skipped
+    assert text_data == {"Page 1": "ACME Corp\nTest text content\n"}
+    assert image_records == [{"page": 1, "index": 1, "filename": "test-doc-id_page_1_image_1.png"}]
+    assert table_data == {}
+
+    # Only the block in the top margin is reported
+    assert margin_blocks == {"Page 1": ["ACME Corp\n"]}
+
+    # The encoded stream is stored byte for byte
+    with open(os.path.join(temp_dir, "test-doc-id_page_1_image_1.png"), "rb") as f:
+        assert f.read() == b"\x89PNG raw bytes"
+
+
+def test_extract_pages_chunk_converts_non_web_images(sample_file_info, temp_dir):
+    """Test that only images browsers cannot display are converted to PNG."""
+    mock_doc = MagicMock()
+    mock_page = MagicMock()
+    mock_page.rect = fitz.Rect(0, 0, 600, 800)
+    mock_page.get_text.return_value = []
+    mock_page.get_images.return_value = [(7, 0, 0, 0, 0, 0, 0), (8, 0, 0, 0, 0, 0, 0)]
+    mock_doc.load_page.return_value = mock_page
+    mock_doc.extract_image.side_effect = [
+        {"image": b"\xff\xd8 jpeg bytes", "ext": "jpeg"},
+        {"image": b"jpx bytes", "ext": "jpx"},
+    ]
+
+    with patch("fitz.open", return_value=mock_doc), \
+            patch("app.services.pdf_service._image_to_png", return_value=b"\x89PNG converted") as mock_convert:
+        _, image_records, _, _ = _extract_pages_chunk(
+            sample_file_info.path, 0, 1, "test-doc-id", temp_dir, convert_images=True
+        )
+
+    # The JPEG is written as extracted, the JPEG 2000 image is converted
+    mock_convert.assert_called_once_with(mock_doc, 8)
+    assert [record["filename"] for record in image_records] == [
+        "test-doc-id_page_1_image_1.jpeg",
+        "test-doc-id_page_1_image_2.png",
+    ]
+    with open(os.path.join(temp_dir, "test-doc-id_page_1_image_1.jpeg"), "rb") as f:
+        assert f.read() == b"\xff\xd8 jpeg bytes"
+    with open(os.path.join(temp_dir, "test-doc-id_page_1_image_2.png"), "rb") as f:
+        assert f.read() == b"\x89PNG converted"
+
+
+def test_extract_text_and_images_splits_pages_across_workers(sample_file_info, monkeypatch, temp_dir):
+    """Test that large documents are extracted in page chunks and merged in order."""
+    monkeypatch.setattr("app.services.pdf_service.settings.IMAGE_FOLDER", temp_dir)
+    monkeypatch.setattr("app.services.pdf_service.settings.EXTRACTION_PROCESSES", 2)
+    monkeypatch.setattr("app.services.pdf_service.settings.PARALLEL_EXTRACTION_MIN_PAGES", 2)
+
+    mock_doc = MagicMock()
+    mock_doc.__len__.return_value = 5
+
+    def extract_pages_chunk(path, start, end, document_id, image_folder, convert_images):
+        text = {f"Page {page + 1}": f"Text {page + 1}" for page in range(start, end)}
+        images = [{"page": start + 1, "index": 1, "filename": f"{document_id}_page_{start + 1}_image_1.png"}]
+        tables = {f"Page {start + 1}": [[["Header"], ["Value"]]]}
+        return text, images, tables, {}
+
+    with patch("fitz.open", return_value=mock_doc), \
+            patch("app.services.pdf_service._get_process_pool", return_value=ThreadPoolExecutor(2)), \
+            patch("app.services.pdf_service._extract_pages_chunk", side_effect=extract_pages_chunk) as mock_chunk:
+        text_data, image_links, table_data = PDFService._extract_text_and_images_sync(
+            sample_file_info.path, "test-doc-id"
+        )
+
+    # Pages were split into one chunk per worker
+    assert [call.args[1:3] for call in mock_chunk.call_args_list] == [(0, 3), (3, 5)]
+
+    # Results are merged back in page order
+    assert list(text_data.pages) == ["Page 1", "Page 2", "Page 3", "Page 4", "Page 5"]
+    assert [image.page for image in image_links] == [1, 4]
+    assert list(table_data.pages) == ["Page 1", "Page 4"]
+    assert image_links[0].document_id == "test-doc-id"
+
+
+def test_extract_text_and_images_pdfplumber_fallback(sample_file_info, monkeypatch, temp_dir):
+    """Test that pages without PyMuPDF tables are re-checked with pdfplumber when enabled."""
+    monkeypatch.setattr("app.services.pdf_service.settings.IMAGE_FOLDER", temp_dir)
+    monkeypatch.setattr("app.services.pdf_service.settings.USE_PDFPLUMBER_TABLE_FALLBACK", True)
+
+    mock_doc = MagicMock()
+    mock_doc.__len__.return_value = 3
+
+    chunk_result = (
+        {"Page 1": "One", "Page 2": "Two", "Page 3": "Three"},
+        [],
+        {"Page 3": [[["PyMuPDF"]]]},
+        {},
+    )
+    fallback_tables = TableData(pages={"Page 1": [[["pdfplumber"]]]})
+
+    with patch("fitz.open", return_value=mock_doc), \
+            patch("app.services.pdf_service._extract_pages_chunk", return_value=chunk_result), \
+            patch.object(PDFService, "_extract_tables_sync", return_value=fallback_tables) as mock_fallback:
+        _, _, table_data = PDFService._extract_text_and_images_sync(sample_file_info.path, "test-doc-id")
+
+    # Only the pages without tables were re-checked
+    mock_fallback.assert_called_once_with(sample_file_info.path, [0, 1])
+
+    # Results are merged in page order
+    assert list(table_data.pages) == ["Page 1", "Page 3"]
+
+
 @pytest.mark.asyncio
 async def test_extract_tables(sample_file_info, monkeypatch):
     """Test extracting tables from a PDF."""
@@ -87,6 +266,62 @@ async def test_extract_tables(sample_file_info, monkeypatch):
     assert table_data.pages["Page 1"][0][1][1] == "Value2"
 
 
+def test_extract_tables_splits_pages_across_workers(sample_file_info, monkeypatch):
+    """Test that tables of large documents are extracted in page chunks and merged in order."""
+    monkeypatch.setattr("app.services.pdf_service.settings.EXTRACTION_PROCESSES", 2)
+    monkeypatch.setattr("app.services.pdf_service.settings.PARALLEL_EXTRACTION_MIN_PAGES", 2)
+
+    mock_pdf = MagicMock()
+    mock_pdf.__enter__.return_value.pages = [MagicMock() for _ in range(10)]
+
+    def extract_tables_chunk(path, page_numbers):
+        return {f"Page {page_numbers[0] + 1}": [[["Header"], ["Value"]]]}
+
+    with patch("pdfplumber.open", return_value=mock_pdf), \
+            patch("app.services.pdf_service._get_process_pool", return_value=ThreadPoolExecutor(2)), \
+            patch("app.services.pdf_service._extract_tables_chunk", side_effect=extract_tables_chunk) as mock_chunk:
+        table_data = PDFService._extract_tables_sync(sample_file_info.path)
+
+    # Pages were split into one chunk per worker
+    assert [call.args[1] for call in mock_chunk.call_args_list] == [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]]
+
+    # Results are merged back in page order
+    assert list(table_data.pages) == ["Page 1", "Page 6"]
+
+
+def test_run_in_process_pool_replaces_broken_pool():
+    """Test that a pool broken by a dead worker is replaced and the work retried once."""
+    broken_pool = MagicMock()
+    broken_pool.submit.side_effect = BrokenProcessPool("worker died")
+
+    with patch("app.services.pdf_service._get_process_pool", side_effect=[broken_pool, ThreadPoolExecutor(2)]):
+        results = _run_in_process_pool(pow, [(2, 3), (3, 2)])
+
+    assert results == [8, 9]
+    broken_pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+    # A second failure in a row is raised
+    with patch("app.services.pdf_service._get_process_pool", return_value=broken_pool):
+        with pytest.raises(BrokenProcessPool):
+            _run_in_process_pool(pow, [(2, 3)])
+
+
+def test_extract_tables_chunk(sample_file_info):
+    """Test extracting tables from a subset of pages."""
+    mock_pdf = MagicMock()
+    pages = [MagicMock() for _ in range(3)]
+    pages[2].extract_tables.return_value = [[["Header"], ["Value"]]]
+    pages[1].extract_tables.return_value = []
+    mock_pdf.__enter__.return_value.pages = pages
+
+    with patch("pdfplumber.open", return_value=mock_pdf):
+        tables = _extract_tables_chunk(sample_file_info.path, [1, 2])
+
+    # Only the requested pages were checked
+    pages[0].extract_tables.assert_not_called()
+    assert tables == {"Page 3": [[["Header"], ["Value"]]]}
+
+
 @pytest.mark.asyncio
 async def test_process_pdf(sample_file_info, db_session, monkeypatch):
     """Test processing a PDF file."""
@@ -99,33 +334,32 @@ async def test_process_pdf(sample_file_info, db_session, monkeypatch):
 
     # Mock the repository methods
     with patch("app.database.repository.PDFRepository.create_document", return_value=document) as mock_create:
-        with patch("app.database.repository.PDFRepository.save_text_content") as mock_save_text:
-            with patch("app.database.repository.PDFRepository.save_images") as mock_save_images:
-                with patch("app.database.repository.PDFRepository.save_tables") as mock_save_tables:
-                    # Mock the extract methods to avoid actual PDF processing
-                    with patch.object(PDFService, "extract_text_and_images") as mock_extract_text:
-                        with patch.object(PDFService, "extract_tables") as mock_extract_tables:
-                            # Setup mock returns
-                            mock_text_data = MagicMock()
-                            mock_text_data.pages = {"Page 1": "Test text"}
-
-                            mock_extract_text.return_value = (mock_text_data, [])
+        with patch("app.database.repository.PDFRepository.save_all") as mock_save_all:
+            # Mock the extract methods to avoid actual PDF processing
+            with patch.object(PDFService, "extract_text_and_images") as mock_extract_text:
+                with patch.object(PDFService, "extract_tables") as mock_extract_tables:
+                    # Setup mock returns
+                    mock_text_data = MagicMock()
+                    mock_text_data.pages = {"Page 1": "Test text"}
 
-                            mock_tables_data = MagicMock()
-                            mock_tables_data.pages = {}
+                    mock_tables_data = MagicMock()
+                    mock_tables_data.pages = {}
 
-                            mock_extract_tables.return_value = mock_tables_data
+                    mock_extract_text.return_value = (mock_text_data, [], mock_tables_data)
 
-                            # Call the method
-                            result = await PDFService.process_pdf(db_session, sample_file_info)
+                    # Call the method
+                    result = await PDFService.process_pdf(db_session, sample_file_info)
 
     # Check that repository methods were called
     mock_create.assert_called_once_with(db_session, sample_file_info)
-    mock_save_text.assert_called_once()
-    mock_save_images.assert_called_once()
 
-    # Since tables is empty, save_tables should not be called
-    mock_save_tables.assert_not_called()
+    # All extracted data is saved with one repository call
+    mock_save_all.assert_called_once_with(
+        db_session, document.id, {"Page 1": "Test text"}, [], {}, None, mock_text_data._boilerplate
+    )
+
+    # Tables come from the same pass, so the PDF is not parsed a second time
+    mock_extract_tables.assert_not_called()
 
     # Check result
     assert result.id == document.id
@@ -135,6 +369,193 @@ async def test_process_pdf(sample_file_info, db_session, monkeypatch):
     assert hasattr(result, "images")
 
 
+@pytest.mark.asyncio
+async def test_process_pdf_releases_extraction_slot_before_summary(sample_file_info, db_session, monkeypatch):
+    """Test that the extraction slot is held while extracting but not while summarizing."""
+    monkeypatch.setattr("app.services.pdf_service.settings.MAX_CONCURRENT_EXTRACTIONS", 1)
+    monkeypatch.setattr("app.services.pdf_service._extraction_semaphore", None)
+
+    document = PDFDocument(
+        id="test-doc-id", filename="test.pdf", original_filename="test.pdf", created_at=datetime.now()
+    )
+    slot_held = {}
+
+    async def extract(file_info, document_id):
+        slot_held["extract"] = _get_extraction_semaphore().locked()
+        return TextData(pages={"Page 1": "Test text"}), [], TableData(pages={})
+
+    async def summarize(text_data):
+        slot_held["summary"] = _get_extraction_semaphore().locked()
+        return "Summary"
+
+    with patch("app.database.repository.PDFRepository.create_document", return_value=document):
+        with patch("app.database.repository.PDFRepository.save_all"):
+            with patch.object(PDFService, "extract_text_and_images", side_effect=extract):
+                with patch.object(PDFService, "generate_summary", side_effect=summarize):
+                    result = await PDFService.process_pdf(db_session, sample_file_info)
+
+    assert result.summary == "Summary"
+    assert slot_held == {"extract": True, "summary": False}
+
+
+@pytest.mark.asyncio
+async def test_process_pdf_reuses_earlier_extraction(db_session, test_pdf_file):
+    """Test that re-uploading the same file skips extraction."""
+    file_info = FileInfo(filename="test.pdf", path=test_pdf_file, content_digest="abc123")
+    existing = MagicMock(text=TextData(pages={"Page 1": "Test text"}))
+
+    with patch.object(PDFService, "_find_processed_sync", return_value=existing) as mock_find, \
+            patch("app.database.repository.PDFRepository.create_document") as mock_create, \
+            patch.object(PDFService, "extract_text_and_images") as mock_extract:
+        result = await PDFService.process_pdf(db_session, file_info, include_summary=False)
+
+    assert result is existing
+    mock_find.assert_called_once_with(db_session, file_info, f"abc123:v{EXTRACTION_VERSION}")
+    mock_create.assert_not_called()
+    mock_extract.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_process_pdf_reused_extraction_skips_boilerplate(threaded_db_session, temp_dir):
+    """Test that a reused extraction is summarized from the same text as the fresh one."""
+    db_session = threaded_db_session
+    first = FileInfo(filename="a.pdf", path=os.path.join(temp_dir, "a.pdf"), content_digest="abc123")
+    second = FileInfo(filename="b.pdf", path=os.path.join(temp_dir, "b.pdf"), content_digest="abc123")
+    for file_info in (first, second):
+        Path(file_info.path).write_bytes(b"%PDF")
+
+    text_data = TextData(pages={"Page 1": "ACME Corp\nBody one\n", "Page 2": "ACME Corp\nBody two\n"})
+    text_data._boilerplate = {"Page 1": ["ACME Corp\n"], "Page 2": ["ACME Corp\n"]}
+
+    with patch.object(PDFService, "extract_text_and_images", return_value=(text_data, [], TableData(pages={}))) \
+            as mock_extract, \
+            patch("app.services.pdf_service.LLMService.summarize_text", AsyncMock(return_value="summary")) \
+            as mock_summarize:
+        await PDFService.process_pdf(db_session, first)
+        await PDFService.process_pdf(db_session, second)
+
+    # The second upload was reused, and its summary input still leaves out the header
+    mock_extract.assert_called_once()
+    fresh_input, reused_input = [call.args[0] for call in mock_summarize.await_args_list]
+    assert fresh_input == reused_input == "Page 1:\nBody one\n\n\nPage 2:\nBody two\n"
+
+
+@pytest.mark.asyncio
+async def test_process_pdf_failed_extraction_not_reused(threaded_db_session, temp_dir):
+    """Test that a failed extraction is not returned for a later upload of the same file."""
+    db_session = threaded_db_session
+    first = FileInfo(filename="a.pdf", path=os.path.join(temp_dir, "a.pdf"), content_digest="abc123")
+    second = FileInfo(filename="b.pdf", path=os.path.join(temp_dir, "b.pdf"), content_digest="abc123")
+    for file_info in (first, second):
+        Path(file_info.path).write_bytes(b"%PDF")
+
+    extracted = (TextData(pages={"Page 1": "Test text"}), [], TableData(pages={}))
+
+    with patch.object(PDFService, "extract_text_and_images", side_effect=[RuntimeError("boom"), extracted]):
+        with pytest.raises(RuntimeError):
+            await PDFService.process_pdf(db_session, first, include_summary=False)
+
+        result = await PDFService.process_pdf(db_session, second, include_summary=False)
+
+    # The second upload was extracted itself and kept
+    assert result.filename == "b.pdf"
+    assert result.text.pages == {"Page 1": "Test text"}
+    assert os.path.exists(second.path)
+
+    # Only the complete document can be reused
+    reused = PDFRepository.get_by_digest(db_session, f"abc123:v{EXTRACTION_VERSION}", datetime.min)
+    assert reused.id == result.id
+
+
+def test_iter_chunks_groups_pages():
+    """Test that pages are grouped into size-limited chunks without splitting pages."""
+    pages = {"Page 1": "a" * 40, "Page 2": "   ", "Page 3": "b" * 40, "Page 4": "c" * 100}
+
+    chunks = list(PDFService._iter_chunks(pages, max_size=100))
+
+    # Blank pages are skipped and oversized pages get their own chunk
+    assert chunks == [
+        f"Page 1:\n{'a' * 40}\n\nPage 3:\n{'b' * 40}",
+        f"Page 4:\n{'c' * 100}",
+    ]
+
+
+def test_find_boilerplate_repeated_margin_blocks():
+    """Test that margin blocks repeated across pages are recognized as headers/footers."""
+    margin_blocks = {
+        f"Page {i}": ["ACME Corp annual report\n", f"Page {i} of 4\n"] for i in range(1, 5)
+    }
+    margin_blocks["Page 2"].append("A one-off caption in the margin\n")
+
+    boilerplate = _find_boilerplate(margin_blocks, page_count=4)
+
+    # Page numbers differ per page but still match, one-off blocks do not
+    assert boilerplate["Page 2"] == ["ACME Corp annual report\n", "Page 2 of 4\n"]
+    assert len(boilerplate) == 4
+
+    # Short documents are left alone
+    assert _find_boilerplate({"Page 1": ["Header\n"], "Page 2": ["Header\n"]}, page_count=2) == {}
+
+
+@pytest.mark.asyncio
+async def test_generate_summary_skips_boilerplate():
+    """Test that running headers and footers are left out of the summary input."""
+    text_data = TextData(pages={"Page 1": "ACME Corp\nBody one\n", "Page 2": "ACME Corp\n"})
+    text_data._boilerplate = {"Page 1": ["ACME Corp\n"], "Page 2": ["ACME Corp\n"]}
+
+    with patch("app.services.pdf_service.LLMService.summarize_text", AsyncMock(return_value="summary")) as mock_summarize:
+        summary = await PDFService.generate_summary(text_data)
+
+    assert summary == "summary"
+    # Page 2 held only its header, so it was skipped entirely
+    mock_summarize.assert_awaited_once_with("Page 1:\nBody one\n")
+
+
+@pytest.mark.asyncio
+async def test_generate_summary_map_reduce(monkeypatch):
+    """Test that long documents are summarized per chunk, then combined."""
+    monkeypatch.setattr("app.services.llm_service.MAX_INPUT_CHARS", 50)
+
+    text_data = TextData(pages={f"Page {i}": f"text of page {i} " * 3 for i in range(1, 4)})
+
+    async def summarize(text):
+        return "final" if text.startswith("Part 1") else f"summary of {text.split(':')[0]}"
+
+    with patch("app.services.pdf_service.LLMService.summarize_text", AsyncMock(side_effect=summarize)) as mock_summarize:
+        summary = await PDFService.generate_summary(text_data)
+
+    assert summary == "final"
+
+    # One call per page-sized chunk plus the final combining call
+    assert mock_summarize.await_count == 4
+    combined = mock_summarize.await_args_list[-1].args[0]
+    assert combined.startswith("Part 1:\nsummary of Page 1")
+
+
+@pytest.mark.asyncio
+async def test_generate_summary_token_dense_text():
+    """Test that chunks are sized in tokens, so dense text is not cut before summarization."""
+    # Fake tokenizer: one token per character, as for most CJK text
+    mock_encoder = MagicMock()
+    mock_encoder.encode.side_effect = lambda text: list(text)
+
+    # Each page fits the character limit many times over, but not the token budget twice
+    page_text = "\u6587" * (MAX_INPUT_TOKENS // 2 + 100)
+    text_data = TextData(pages={f"Page {i}": page_text for i in range(1, 4)})
+
+    with patch.object(LLMService, "_get_encoder", return_value=mock_encoder):
+        with patch("app.services.pdf_service.LLMService.summarize_text", AsyncMock(return_value="summary")) as mock_summarize:
+            summary = await PDFService.generate_summary(text_data)
+
+    assert summary == "summary"
+
+    # One map call per page, each within the token budget, plus the reduce call
+    map_inputs = [call.args[0] for call in mock_summarize.await_args_list[:-1]]
+    assert len(map_inputs) == 3
+    assert all(len(chunk) <= MAX_INPUT_TOKENS for chunk in map_inputs)
+    assert "".join(map_inputs).count("\u6587") == 3 * len(page_text)
+
+
 @pytest.mark.asyncio
 async def test_get_pdf_by_id(db_session, monkeypatch):
     """Test retrieving a processed PDF by ID."""
@@ -213,4 +634,39 @@ async def test_get_pdf_by_id_not_found(db_session):
         result = await PDFService.get_pdf_by_id(db_session, "non-existent-id")
 
     # Check result
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_stream_pdf_content(threaded_db_session, monkeypatch):
+    """Test streaming a stored PDF as NDJSON in batches."""
+    monkeypatch.setattr("app.utils.file_utils.settings.API_PREFIX", "/api/v1")
+    monkeypatch.setattr("app.services.pdf_service.STREAM_BATCH_SIZE", 2)
+    db_session = threaded_db_session
+
+    document = PDFDocument(id="test-doc-id", filename="test.pdf", original_filename="test.pdf")
+    db_session.add(document)
+    db_session.add_all(
+        TextContent(document_id=document.id, page_number=page, content=f"Page {page} text")
+        for page in (3, 1, 2)
+    )
+    db_session.add(Table(document_id=document.id, page_number=2, table_index=0, table_data=json.dumps([["Header1"]])))
+    db_session.add(Image(document_id=document.id, page_number=1, image_index=1, filename="test_image.png"))
+    db_session.commit()
+
+    chunks = [chunk async for chunk in PDFService.stream_pdf_content(db_session, document)]
+    lines = [json.loads(line) for line in b"".join(chunks).splitlines()]
+
+    # Document header, then two batches of text, then tables and images
+    assert len(chunks) == 5
+    assert lines[0]["type"] == "document"
+    assert lines[0]["id"] == "test-doc-id"
+    assert [line["page"] for line in lines if line["type"] == "text"] == [1, 2, 3]
+    assert lines[4] == {"type": "table", "page": 2, "index": 0, "data": [["Header1"]]}
+    assert lines[5] == {
+        "type": "image",
+        "page": 1,
+        "index": 1,
+        "filename": "test_image.png",
+        "url": "/api/v1/images/test_image.png",
+    }
@@ -0,0 +1,111 @@
+import json
+from datetime import datetime, timedelta
+
+from app.database.repository import PDFRepository
+from app.database.models import PDFDocument
+
+
+def test_count_documents(db_session):
+    """Test counting documents."""
+    # Empty table
+    assert PDFRepository.count_documents(db_session) == 0
+
+    # Create sample documents
+    for i in range(3):
+        db_session.add(
+            PDFDocument(id=f"doc-{i}", filename=f"test{i}.pdf", original_filename=f"test{i}.pdf")
+        )
+    db_session.commit()
+
+    # Check count
+    assert PDFRepository.count_documents(db_session) == 3
+
+
+def test_list_documents_loads_relations(db_session):
+    """Test that listed documents come with their relations loaded."""
+    db_session.add(PDFDocument(id="doc-1", filename="test.pdf", original_filename="test.pdf"))
+    db_session.commit()
+    db_session.expunge_all()
+
+    documents = PDFRepository.list_documents(db_session)
+
+    # Relations are accessible without a lazy load
+    assert len(documents) == 1
+    assert "images" in documents[0].__dict__
+    assert "text_contents" in documents[0].__dict__
+    assert "tables" in documents[0].__dict__
+
+
+def test_save_tables_round_trip(db_session):
+    """Test that saved tables decode back to the same cell grid."""
+    db_session.add(PDFDocument(id="doc-1", filename="test.pdf", original_filename="test.pdf"))
+    db_session.commit()
+
+    table = [["Header1", "Header2"], ["Value1", None]]
+    PDFRepository.save_all(db_session, "doc-1", {}, [], {"Page 2": [table]})
+    saved = PDFRepository.get_document_with_relations(db_session, "doc-1").tables
+
+    assert len(saved) == 1
+    assert saved[0].page_number == 2
+    assert json.loads(saved[0].table_data) == table
+
+
+def test_save_all_bulk_inserts_images(db_session):
+    """Test that image rows are inserted in bulk with generated IDs."""
+    db_session.add(PDFDocument(id="doc-1", filename="test.pdf", original_filename="test.pdf"))
+    db_session.commit()
+
+    images = [(1, 1, "doc-1_page_1_image_1.png"), (2, 1, "doc-1_page_2_image_1.jpeg")]
+    PDFRepository.save_all(db_session, "doc-1", {}, images, {})
+
+    saved = PDFRepository.get_document_with_relations(db_session, "doc-1").images
+    assert sorted((image.page_number, image.image_index, image.filename) for image in saved) == images
+    assert all(image.id for image in saved)
+    assert len({image.id for image in saved}) == 2
+
+
+def test_save_all_single_transaction(db_session):
+    """Test that text, images and tables are saved together."""
+    db_session.add(PDFDocument(id="doc-1", filename="test.pdf", original_filename="test.pdf"))
+    db_session.commit()
+
+    PDFRepository.save_all(
+        db_session,
+        "doc-1",
+        {"Page 1": "First page", "Page 2": "Second page"},
+        [(1, 1, "doc-1_page_1_image_1.png")],
+        {"Page 2": [[["Header1"], ["Value1"]]]},
+        content_digest="key",
+        boilerplate={"Page 1": ["Header\n"]}
+    )
+    db_session.expire_all()
+
+    document = PDFRepository.get_document_with_relations(db_session, "doc-1")
+    # The digest and boilerplate are recorded together with the content
+    assert document.content_digest == "key"
+    assert json.loads(document.boilerplate) == {"Page 1": ["Header\n"]}
+    assert sorted((t.page_number, t.content) for t in document.text_contents) == [
+        (1, "First page"), (2, "Second page")
+    ]
+    assert [(i.page_number, i.filename) for i in document.images] == [(1, "doc-1_page_1_image_1.png")]
+    assert [(t.page_number, t.table_index) for t in document.tables] == [(2, 0)]
+    assert json.loads(document.tables[0].table_data) == [["Header1"], ["Value1"]]
+
+
+def test_get_by_digest(db_session):
+    """Test finding a recent document by its content digest."""
+    now = datetime.now()
+    db_session.add(PDFDocument(
+        id="old", filename="a.pdf", original_filename="a.pdf", content_digest="key", created_at=now - timedelta(hours=1)
+    ))
+    db_session.add(PDFDocument(
+        id="new", filename="b.pdf", original_filename="b.pdf", content_digest="key", created_at=now
+    ))
+    db_session.commit()
+
+    # The newest match inside the window is returned
+    assert PDFRepository.get_by_digest(db_session, "key", now - timedelta(minutes=10)).id == "new"
+
+    # Documents outside the window or with another digest are ignored
+    assert PDFRepository.get_by_digest(db_session, "key", now + timedelta(minutes=1)) is None
+    assert PDFRepository.get_by_digest(db_session, "other", now - timedelta(days=1)) is None
@@ -2,7 +2,8 @@ import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 
-from app.controllers.worker_controller import get_worker_status
+from app.controllers.worker_controller import get_worker_status, get_llm_status
+from app.config import settings
 from app.workers.file_cleanup import FileCleanupWorker
 
 
@@ -83,4 +84,17 @@ async def test_get_worker_status_error_handling():
     assert response["file_cleanup_worker"]["next_run"] is None
     assert response["file_cleanup_worker"]["job_count"] == 0
     assert "error" in response["file_cleanup_worker"]
-    assert "Unexpected error" in response["file_cleanup_worker"]["error"]
\ No newline at end of file
+    assert "Unexpected error" in response["file_cleanup_worker"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_get_llm_status():
+    """Test getting the LLM service status."""
+    with patch("app.controllers.worker_controller.LLMService.is_available", return_value=True):
+        response = await get_llm_status()
+
+    # Check response reflects the configured provider
+    assert response["llm_service"]["available"] is True
+    assert response["llm_service"]["provider"] == settings.LLM_PROVIDER
+    assert response["llm_service"]["model"] == settings.llm_model
+    assert response["llm_service"]["host"] == settings.llm_host